@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark offline dos scrapers: páginas gravadas (bench/paginas) servidas
+localmente, sem tocar no site.
+"""
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark offline e reprodutível: vazão (itens/s), CPU e RSS de cada caminho,
+com as páginas gravadas servidas localmente (bench/servidor.py).
+CPU e RSS são da árvore de processos (Python + chromedriver + Chrome), onde
+fica quase todo o custo do caminho Chrome: os descendentes são amostrados em
+/proc durante o caso; fora do Linux, só o que o RUSAGE_CHILDREN enxerga.
+
+    python -m bench.benchmark                 # parse, HTTP e armazenamento
+    python -m bench.benchmark --chrome        # inclui o caminho Chrome (precisa do Chrome)
+    python -m bench.benchmark --urls 500 --workers 8
+
+Cada execução acrescenta uma linha em bench/resultados.jsonl com o commit
+atual, para comparar entre commits.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench.servidor import PAGINAS, Handler, servir
+from carrefour.http_fetch import LdJsonParser, build_session, fetch_ldjson
+from carrefour.ldjson import coerce_price, listing_from_blocks, parse_jsonld, product_from_blocks
+from carrefour.precos import normalizar_coluna
+from carrefour.supervisor import descendentes, rss_kb
+
+RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados.jsonl")
+
+PRECOS_TEXTO = ["12.99", "R$ 1.299,90", "4,79", "1.299", "1399.90", 8.49, None, "R$ 19,90", "abc"]
+
+
+def _rss_proprio_mb() -> float:
+    # ru_maxrss: KB no Linux, bytes no macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024 if platform.system() == "Darwin" else 1024)
+
+
+def _cpu_ticks(pid: int) -> int:
+    """utime + stime do processo (ticks), de /proc/<pid>/stat; 0 se já saiu."""
+    try:
+        with open(f"/proc/{pid}/stat") as fh:
+            campos = fh.read().rsplit(")", 1)[1].split()
+        return int(campos[11]) + int(campos[12])
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+class AmostradorArvore:
+    """
+    Numa thread, amostra os descendentes deste processo (chromedriver, Chrome):
+    pico de RSS da árvore (Python + descendentes) e a última CPU vista de cada PID.
+    """
+
+    def __init__(self, intervalo: float = 0.1):
+        self.intervalo = intervalo
+        self.pico_kb = 0
+        self.ticks = {}
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._rodar, name="bench-amostrador", daemon=True)
+
+    def _amostrar(self):
+        pids = descendentes(os.getpid())
+        self.pico_kb = max(self.pico_kb, rss_kb(os.getpid()) + sum(rss_kb(p) for p in pids))
+        for p in pids:
+            self.ticks[p] = max(self.ticks.get(p, 0), _cpu_ticks(p))
+
+    def _rodar(self):
+        while not self._parar.wait(self.intervalo):
+            self._amostrar()
+
+    def __enter__(self):
+        self._amostrar()
+        self._base = dict(self.ticks)   # CPU que os descendentes já tinham antes do caso
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._thread.join()
+        self._amostrar()
+
+    def cpu_descendentes_s(self) -> float:
+        ticks = sum(t - self._base.get(p, 0) for p, t in self.ticks.items())
+        return ticks / os.sysconf("SC_CLK_TCK")
+
+
+def medir(nome: str, itens: int, fn) -> dict:
+    """
+    Roda fn() uma vez e devolve wall, itens/s, CPU (do Python e da árvore
+    inteira) e RSS de pico da árvore de processos.
+    """
+    filhos0 = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    with AmostradorArvore() as amostra:
+        fn()
+    wall = time.perf_counter() - t0
+    cpu_proc = time.process_time() - cpu0
+    filhos1 = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # filhos já encerrados e colhidos (RUSAGE_CHILDREN) ou amostrados vivos em /proc
+    reaped = (filhos1.ru_utime + filhos1.ru_stime) - (filhos0.ru_utime + filhos0.ru_stime)
+    cpu_filhos = max(reaped, amostra.cpu_descendentes_s())
+    r = {
+        "caso": nome, "itens": itens, "wall_s": round(wall, 3),
+        "itens_por_s": round(itens / wall, 1) if wall else None,
+        "cpu_proc_s": round(cpu_proc, 3),
+        "cpu_arvore_s": round(cpu_proc + cpu_filhos, 3),
+        "rss_pico_arvore_mb": round(max(amostra.pico_kb / 1024, _rss_proprio_mb()), 1),
+    }
+    print(f"{nome:<14} {itens:>7} itens  {r['itens_por_s']:>10} it/s  "
+          f"wall {r['wall_s']:>7.3f}s  cpu py {r['cpu_proc_s']:>7.3f}s / árvore {r['cpu_arvore_s']:>7.3f}s  "
+          f"rss árvore {r['rss_pico_arvore_mb']} MB")
+    return r
+
+
+def _blocos_gravados() -> list:
+    blocos = []
+    for html in PAGINAS.values():
+        p = LdJsonParser()
+        p.feed(html.decode("utf-8"))
+        blocos.append(p.blocos)
+    return blocos
+
+
+def caso_parse(repeticoes: int) -> dict:
+    paginas = _blocos_gravados()
+
+    def rodar():
+        for _ in range(repeticoes):
+            for blocos in paginas:
+                for raw in blocos:
+                    parse_jsonld(raw)
+                product_from_blocks(blocos)
+                listing_from_blocks(blocos)
+
+    return medir("parse_jsonld", repeticoes * len(paginas), rodar)
+
+
+def caso_preco(repeticoes: int) -> dict:
+    def rodar():
+        for _ in range(repeticoes):
+            for v in PRECOS_TEXTO:
+                coerce_price(v)
+
+    return medir("coerce_price", repeticoes * len(PRECOS_TEXTO), rodar)
+
+
+def caso_preco_coluna(repeticoes: int) -> dict:
+    # backfill: a mesma amostra como uma coluna só, normalizada de uma vez
+    coluna = PRECOS_TEXTO * repeticoes
+    return medir("preco_coluna", len(coluna), lambda: normalizar_coluna(coluna))
+
+
+def _urls(base: str, n: int) -> list:
+    return [f"{base}produto-bench-{i + 1}/p" for i in range(n)]
+
+
+def caso_http(base: str, n: int, workers: int, cauda_kb: int = 0) -> dict:
+    """
+    Caminho HTTP; `conexoes` = conexões TCP abertas pelo pool (keep-alive ideal:
+    = workers). cauda_kb > 0 serve páginas grandes (conteúdo depois do ld+json).
+    """
+    session = build_session(pool_size=workers)
+    urls = _urls(base, n)
+    antes = Handler.conexoes
+    if cauda_kb:
+        urls = [f"{u}?cauda={cauda_kb}" for u in urls]
+
+    def rodar():
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            achados = list(ex.map(lambda u: product_from_blocks(fetch_ldjson(session, u, cache=None)), urls))
+        assert all(achados), "página gravada sem Product"
+
+    r = medir(f"http_cauda{cauda_kb}" if cauda_kb else "http", n, rodar)
+    r["conexoes"] = Handler.conexoes - antes
+    print(f"{'':<14} {r['conexoes']} conexão(ões) TCP para {n} URL(s)")
+    return r
+
+
+def caso_chrome(base: str, n: int, workers: int) -> dict:
+    from carrefour.browser import build_driver
+    from carrefour.pool import coletar_em_pool
+    from carrefour.scrape import scrape_product_via_json
+
+    urls = _urls(base, n)
+
+    def rodar():
+        with contextlib.redirect_stdout(io.StringIO()):
+            coletar_em_pool(urls, build_driver=build_driver, scrape=scrape_product_via_json, workers=workers)
+
+    return medir("chrome", n, rodar)
+
+
+def caso_armazenamento(produtos: int, dias: int) -> dict:
+    from carrefour.parquet_store import gravar_dia
+    from carrefour.storage import salvar_mensal
+
+    pasta = tempfile.mkdtemp(prefix="bench_")
+
+    def rodar():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for d in range(1, dias + 1):
+                regs = [
+                    {"Cidade": "Bench", "ID do Produto": str(i), "Nome do Produto": f"Produto {i}",
+                     "Preço": 0.0 if i % 50 == 0 else 10.0 + d + i / 100, "URL": f"https://x/p-{i}/p"}
+                    for i in range(1, produtos + 1)
+                ]
+                data_str = f"2025-01-{d:02d}"
+                gravar_dia(regs, pasta, data_str, cidade="Bench")
+                salvar_mensal(regs, os.path.join(pasta, "precos.xlsx"), os.path.join(pasta, "erros.xlsx"),
+                              f"Preço_202501{d:02d}", data_str)
+
+    return medir("armazenamento", produtos * dias, rodar)
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark offline dos scrapers do Carrefour")
+    ap.add_argument("--urls", type=int, default=300, help="URLs no caminho HTTP/Chrome")
+    ap.add_argument("--workers", type=int, default=8)
+    ap.add_argument("--repeticoes", type=int, default=2000, help="repetições do parse/preço")
+    ap.add_argument("--produtos", type=int, default=150)
+    ap.add_argument("--dias", type=int, default=10)
+    ap.add_argument("--cauda-kb", type=int, default=200, help="KB depois do ld+json no caso http_cauda")
+    ap.add_argument("--chrome", action="store_true", help="inclui o caminho Chrome")
+    ap.add_argument("--saida", default=RESULTADOS)
+    args = ap.parse_args(argv)
+
+    servidor, base = servir()
+    try:
+        casos = [
+            caso_parse(args.repeticoes),
+            caso_preco(args.repeticoes * 10),
+            caso_preco_coluna(args.repeticoes * 10),
+            caso_http(base, args.urls, args.workers),
+            caso_http(base, args.urls, args.workers, cauda_kb=args.cauda_kb),
+            caso_armazenamento(args.produtos, args.dias),
+        ]
+        if args.chrome:
+            casos.append(caso_chrome(base, min(args.urls, 60), min(args.workers, 4)))
+    finally:
+        servidor.shutdown()
+
+    linha = {
+        "commit": _commit(),
+        "quando": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "parametros": vars(args),
+        "casos": casos,
+    }
+    with open(args.saida, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(linha, ensure_ascii=False) + "\n")
+    print(f"📈 Resultado acrescentado em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor local que imita o mercado.carrefour.com.br para testes de carga e
+latência, sem tocar no site:
+
+- home com banner de cookies e fluxo de CEP (o que o fix_location percorre);
+  o CEP confirmado vira cookie "regiao" + localStorage e aparece na página
+- páginas de produto/listagem gravadas (bench/paginas, via bench/servidor.py)
+- sitemap.xml com os produtos de carrefour/urls.py (descoberta do catálogo)
+- páginas com ETag (GET condicional devolve 304)
+- falhas injetadas: latência (+ jitter), 429 com Retry-After, timeouts e um
+  layout alternativo ("b": outros textos/atributos nos botões e no campo de CEP)
+
+As falhas são sorteadas de forma determinística por (semente, caminho, tentativa),
+independente da ordem das threads. Para apontar os scrapers para ele:
+
+    python -m bench.mock_carrefour --porta 8000 --latencia-ms 150 --taxa-429 0.05
+    CARREFOUR_BASE_URL=http://127.0.0.1:8000 CARREFOUR_CACHE_DIR=/tmp/mock-cache \\
+        python -m carrefour.runner bh
+"""
+
+import argparse
+import hashlib
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from bench.servidor import PAGINAS, Handler, pagina_para, servir
+from carrefour.urls import SITE, URLS, eh_produto
+
+HOME_A = """<!DOCTYPE html>
+<html lang="pt-BR"><head><meta charset="utf-8"><title>Carrefour Mercado</title></head>
+<body>
+<div id="consent"><p>Usamos cookies.</p><button id="onetrust-accept-btn-handler">Aceitar</button></div>
+<header><button id="abrir-endereco">Informe seu endereço</button><span id="regiao-atual">{regiao}</span></header>
+<div id="modal" style="display:none">
+  <input id="cep" type="text" placeholder="Digite seu CEP">
+  <button id="confirmar">Confirmar</button>
+</div>
+{script}
+</body></html>
+"""
+
+HOME_B = """<!DOCTYPE html>
+<html lang="pt-BR"><head><meta charset="utf-8"><title>Carrefour Mercado</title></head>
+<body>
+<div id="consent"><button class="cookies-ok">Concordo</button></div>
+<header><div class="address-selector"><button>Alterar endereço</button></div>
+<span id="regiao-atual">{regiao}</span></header>
+<div id="modal" style="display:none">
+  <form onsubmit="return false"><input id="cep" name="zipcode" type="text" aria-label="CEP">
+  <button id="confirmar" type="submit">Buscar</button></form>
+</div>
+{script}
+</body></html>
+"""
+
+SCRIPT_HOME = """<script>
+const q = (s) => document.querySelector(s);
+const consent = q('#consent button');
+consent.addEventListener('click', () => { q('#consent').style.display = 'none'; });
+q('header button').addEventListener('click', () => { q('#modal').style.display = 'block'; });
+q('#confirmar').addEventListener('click', () => {
+  const digitos = q('#cep').value.replace(/\\D/g, '');
+  if (digitos.length !== 8) return;
+  const cep = digitos.slice(0, 5) + '-' + digitos.slice(5);
+  document.cookie = 'regiao=' + digitos + '; path=/; max-age=604800';
+  localStorage.setItem('regiao', cep);
+  setTimeout(() => {
+    q('#modal').style.display = 'none';
+    q('#regiao-atual').textContent = 'Entregando em CEP ' + cep;
+  }, 200);
+});
+</script>"""
+
+
+@dataclass
+class Config:
+    latencia_ms: float = 0.0
+    jitter_ms: float = 0.0
+    taxa_429: float = 0.0
+    retry_after_s: int = 1
+    taxa_timeout: float = 0.0
+    espera_timeout_s: float = 30.0
+    layout: str = "a"
+    semente: int = 0
+
+
+def _sitemap_indice(base: str) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"<sitemap><loc>{base}sitemap/product-0.xml</loc></sitemap>"
+        f"<sitemap><loc>{base}sitemap/category-0.xml</loc></sitemap>"
+        "</sitemapindex>"
+    ).encode()
+
+
+def _sitemap_produtos(base: str) -> bytes:
+    locs = "".join(
+        f"<url><loc>{base}{u.split('/', 3)[-1]}</loc></url>" for u in URLS if eh_produto(u)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{locs}</urlset>'
+    ).encode()
+
+
+def criar_handler(cfg: Config):
+    tentativas = {}
+    lock = threading.Lock()
+
+    class MockHandler(Handler):
+        def _sorteio(self) -> random.Random:
+            with lock:
+                n = tentativas[self.path] = tentativas.get(self.path, 0) + 1
+            return random.Random(f"{cfg.semente}:{self.path}:{n}")
+
+        def _base(self) -> str:
+            return f"http://{self.headers.get('Host', '127.0.0.1')}/"
+
+        def do_GET(self):
+            caminho = self.path.split("?", 1)[0]
+            if caminho.startswith("/static/"):
+                return super().do_GET()
+
+            sorte = self._sorteio()
+            if cfg.latencia_ms or cfg.jitter_ms:
+                time.sleep(max(0.0, cfg.latencia_ms + sorte.uniform(-cfg.jitter_ms, cfg.jitter_ms)) / 1000)
+            if sorte.random() < cfg.taxa_429:
+                self.send_response(429)
+                self.send_header("Retry-After", str(cfg.retry_after_s))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if sorte.random() < cfg.taxa_timeout:
+                time.sleep(cfg.espera_timeout_s)
+
+            if caminho in ("/", ""):
+                cookies = self.headers.get("Cookie", "")
+                regiao = ""
+                for parte in cookies.split(";"):
+                    nome, _, valor = parte.strip().partition("=")
+                    if nome == "regiao" and len(valor) == 8:
+                        regiao = f"Entregando em CEP {valor[:5]}-{valor[5:]}"
+                modelo = HOME_B if cfg.layout == "b" else HOME_A
+                return self._responder(200, modelo.format(regiao=regiao, script=SCRIPT_HOME).encode())
+            if caminho == "/sitemap.xml":
+                return self._responder(200, _sitemap_indice(self._base()), "application/xml")
+            if caminho == "/sitemap/product-0.xml":
+                return self._responder(200, _sitemap_produtos(self._base()), "application/xml")
+            if caminho.startswith("/sitemap/"):
+                return self._responder(200, b'<?xml version="1.0"?><urlset/>', "application/xml")
+            nome = pagina_para(caminho)
+            if nome is None:
+                return self._responder(404, b"nao encontrado", "text/plain")
+            self._responder_pagina(PAGINAS[nome])
+
+        def _responder_pagina(self, corpo: bytes):
+            # validador como o do site: 304 quando o ETag pedido ainda vale
+            etag = '"%s"' % hashlib.sha1(corpo).hexdigest()[:16]
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(corpo)
+
+    return MockHandler
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=f"Imitação local de {SITE} para testes de carga")
+    ap.add_argument("--porta", type=int, default=8000)
+    ap.add_argument("--latencia-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--taxa-429", type=float, default=0.0, help="fração das requisições com 429")
+    ap.add_argument("--retry-after", type=int, default=1, help="Retry-After (s) dos 429")
+    ap.add_argument("--taxa-timeout", type=float, default=0.0, help="fração que demora --espera-timeout")
+    ap.add_argument("--espera-timeout", type=float, default=30.0)
+    ap.add_argument("--layout", choices=("a", "b"), default="a")
+    ap.add_argument("--semente", type=int, default=0)
+    args = ap.parse_args(argv)
+    cfg = Config(
+        latencia_ms=args.latencia_ms, jitter_ms=args.jitter_ms, taxa_429=args.taxa_429,
+        retry_after_s=args.retry_after, taxa_timeout=args.taxa_timeout,
+        espera_timeout_s=args.espera_timeout, layout=args.layout, semente=args.semente,
+    )
+    srv, base = servir(args.porta, criar_handler(cfg))
+    print(f"🧪 Carrefour de mentira em {base} ({cfg})")
+    print(f"   CARREFOUR_BASE_URL={base.rstrip('/')} python -m carrefour.runner")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        srv.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor local das páginas gravadas (bench/paginas/*.html).
+
+    /<slug>-<sku>/p      página de produto; a variante de ld+json sai do SKU
+                         (objeto, lista, @graph, priceSpecification, lista de offers)
+    /<slug>-0/p          página sem Product
+    /busca/<termo>       listagem (ItemList)
+    ?cauda=<kb>          acrescenta <kb> KB de HTML depois do ld+json (páginas grandes)
+    /static/*            JS/CSS mínimos
+
+Uso: python -m bench.servidor [porta]
+"""
+
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PASTA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paginas")
+VARIANTES = [
+    "produto_simples", "produto_lista", "produto_graph", "produto_price_spec", "produto_offers_lista",
+]
+_RE_PRODUTO = re.compile(r"-(\d+)/p/?$")
+
+
+def _carregar() -> dict:
+    paginas = {}
+    for nome in os.listdir(PASTA):
+        if nome.endswith(".html"):
+            with open(os.path.join(PASTA, nome), "rb") as fh:
+                paginas[nome[:-5]] = fh.read()
+    return paginas
+
+
+PAGINAS = _carregar()
+_RE_CAUDA = re.compile(r"[?&]cauda=(\d+)")
+
+
+def com_cauda(corpo: bytes, caminho: str) -> bytes:
+    """Página com ?cauda=<kb>: KB extras de HTML depois do ld+json (antes do </body>)."""
+    m = _RE_CAUDA.search(caminho)
+    if not m:
+        return corpo
+    linha = b"<div class=\"vitrine\">" + b"x" * 1000 + b"</div>\n"
+    return corpo.replace(b"</body>", linha * int(m.group(1)) + b"</body>", 1)
+
+
+def pagina_para(caminho: str):
+    """Nome da página gravada para o caminho pedido (None = 404)."""
+    caminho = caminho.split("?", 1)[0]
+    if caminho.startswith("/busca/"):
+        return "listagem"
+    m = _RE_PRODUTO.search(caminho)
+    if not m:
+        return None
+    sku = int(m.group(1))
+    return "sem_produto" if sku == 0 else VARIANTES[sku % len(VARIANTES)]
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # conexões TCP aceitas (uma instância por conexão; keep-alive reaproveita)
+    conexoes = 0
+    _lock_conexoes = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with Handler._lock_conexoes:
+            Handler.conexoes += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, status: int, corpo: bytes, tipo: str = "text/html; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        if self.path.startswith("/static/"):
+            tipo = "text/css" if self.path.endswith(".css") else "application/javascript"
+            return self._responder(200, b"/* estatico */", tipo)
+        if self.path in ("/", ""):
+            return self._responder(200, PAGINAS["sem_produto"])
+        nome = pagina_para(self.path)
+        if nome is None:
+            return self._responder(404, b"nao encontrado", "text/plain")
+        self._responder(200, com_cauda(PAGINAS[nome], self.path))
+
+
+def servir(porta: int = 0, handler=Handler):
+    """Sobe o servidor numa thread; devolve (servidor, base_url com / no fim)."""
+    servidor = ThreadingHTTPServer(("127.0.0.1", porta), handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="bench-servidor", daemon=True).start()
+    return servidor, f"http://127.0.0.1:{servidor.server_address[1]}/"
+
+
+if __name__ == "__main__":
+    srv, base = servir(int(sys.argv[1]) if len(sys.argv) > 1 else 8000)
+    print(f"Servindo páginas gravadas em {base} (Ctrl+C para sair)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        srv.shutdown()
@@ -0,0 +1,4 @@
+# -*- coding: utf-8 -*-
+"""
+Peças compartilhadas pelos scrapers do Carrefour (scraper_carrefour*.py).
+"""
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Driver Chrome headless e fixação da localização (CEP) no site.
+"""
+
+from selenium import webdriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+from carrefour.metricas import ETAPAS
+from carrefour.rede import configurar_bloqueio, opcoes_chrome
+from carrefour.urls import BASE_URL
+from carrefour.wait import ESPERA_PRODUTO, esperar_dom, esperar_sumir
+
+HOME = BASE_URL
+
+
+@ETAPAS.cronometrar("build_driver")
+def build_driver(headless: bool = True):
+    opts = webdriver.ChromeOptions()
+    if headless:
+        opts.add_argument("--headless=new")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--window-size=1920,1080")
+    opts.page_load_strategy = "eager"
+    # desliga imagens para ganhar velocidade
+    opts.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2
+    })
+    opcoes_chrome(opts)
+    driver = webdriver.Chrome(options=opts)
+    # fontes, mídia e terceiros bloqueados via CDP (carrefour/rede.py)
+    configurar_bloqueio(driver)
+    driver.set_page_load_timeout(60)
+    driver.implicitly_wait(2)
+    # cobre o prazo do execute_async_script de espera/extração (carrefour/wait.py)
+    driver.set_script_timeout(max(30, ESPERA_PRODUTO + 5))
+    return driver
+
+
+# seletores candidatos (o site muda com frequência); a ordem é a de tentativa
+XPATHS_CONSENT = [
+    '//button[contains(., "Aceitar") or contains(., "Continuar") or contains(., "Concordo")]',
+    '//button[contains(@id,"onetrust-accept-btn-handler")]',
+    '//button[contains(., "OK")]',
+]
+XPATHS_ENDERECO = [
+    '//button[contains(., "Informe seu endereço")]',
+    '//button[contains(., "Alterar endereço")]',
+    '//button[contains(., "Mudar endereço")]',
+    '//button[contains(., "Endereço")]',
+    '//button[contains(@aria-label,"Endereço")]',
+    '//div[contains(@class,"address")]//button',
+    '//button[contains(@data-testid,"address") or contains(@data-testid,"location")]',
+]
+XPATHS_CEP = [
+    '//input[@name="zipcode" or @id="zipcode" or contains(@placeholder,"CEP")]',
+    '//input[contains(@aria-label,"CEP")]',
+    '//input[@type="text" and (contains(@placeholder,"CEP") or contains(@data-testid,"cep"))]',
+]
+XPATHS_CONFIRMAR = [
+    '//button[contains(., "Confirmar") or contains(., "Continuar") or contains(., "Buscar") or contains(., "OK")]',
+    '//button[@type="submit"]',
+]
+
+# avalia todos os XPaths de uma vez no navegador; devolve [índice, elemento]
+# do primeiro visível e habilitado (ou só presente, com arguments[1] = false)
+JS_PRIMEIRO_XPATH = """
+const xpaths = arguments[0], visivel = arguments[1];
+for (let i = 0; i < xpaths.length; i++) {
+  let r;
+  try {
+    r = document.evaluate(xpaths[i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+  } catch (e) { continue; }
+  for (let j = 0; j < r.snapshotLength; j++) {
+    const el = r.snapshotItem(j);
+    if (!visivel) return [i, el];
+    const st = window.getComputedStyle(el);
+    if (el.getClientRects().length && st.visibility !== 'hidden' && !el.disabled) return [i, el];
+  }
+}
+return null;
+"""
+
+
+def _ordenar(xpaths, preferido=None):
+    """Coloca o seletor que funcionou na última vez na frente da lista."""
+    if preferido in xpaths:
+        return [preferido] + [x for x in xpaths if x != preferido]
+    return list(xpaths)
+
+
+def primeiro_xpath(driver, xpaths, timeout: float = 4.0, visivel: bool = True):
+    """
+    Sonda todos os XPaths numa única chamada, repetindo até o prazo (curto).
+    Retorna (xpath, elemento) ou (None, None).
+    """
+    try:
+        i, el = WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script(JS_PRIMEIRO_XPATH, xpaths, visivel)
+        )
+        return xpaths[i], el
+    except Exception:
+        return None, None
+
+
+@ETAPAS.cronometrar("fix_location")
+def fix_location(driver, cep: str, preferidos=None) -> dict:
+    """
+    Tenta abrir a home, acionar o seletor de endereço e setar o CEP informado.
+    Implementa múltiplos fallbacks de seletores porque o site muda com frequência;
+    todos os candidatos de cada passo são sondados juntos, com prazo curto.
+    `preferidos` ({passo: xpath}) são tentados primeiro. Retorna os seletores
+    que funcionaram ({} se o campo de CEP não foi encontrado).
+    """
+    preferidos = preferidos or {}
+    usados = {}
+    home = HOME
+    driver.get(home)
+    esperar_dom(driver)
+
+    # Alguns sites mostram pop-ups de cookies. Tenta dispensar.
+    xpath, btn = primeiro_xpath(driver, _ordenar(XPATHS_CONSENT, preferidos.get("consent")), timeout=3)
+    if btn is not None:
+        try:
+            btn.click()
+            esperar_sumir(driver, btn)
+            usados["consent"] = xpath
+        except Exception:
+            pass
+
+    # Abre o seletor de endereço (várias estratégias)
+    xpath, btn = primeiro_xpath(driver, _ordenar(XPATHS_ENDERECO, preferidos.get("endereco")))
+    if btn is not None:
+        try:
+            btn.click()
+            usados["endereco"] = xpath
+        except Exception:
+            pass
+
+    # Se não abriu explicitamente, às vezes já há input na home
+    # Procura o campo de CEP
+    xpath, input_el = primeiro_xpath(
+        driver, _ordenar(XPATHS_CEP, preferidos.get("cep")), visivel=False,
+    )
+    if input_el is None:
+        return {}
+    usados["cep"] = xpath
+
+    try:
+        input_el.clear()
+        input_el.send_keys(cep)
+    except Exception:
+        pass
+
+    # Confirmar/continuar (botões comuns)
+    xpath, btn = primeiro_xpath(driver, _ordenar(XPATHS_CONFIRMAR, preferidos.get("confirmar")), timeout=2)
+    if btn is not None:
+        try:
+            btn.click()
+            esperar_sumir(driver, input_el)
+            usados["confirmar"] = xpath
+        except Exception:
+            pass
+
+    # Mais um pequeno passeio pela home para consolidar o contexto regional
+    driver.get(home)
+    esperar_dom(driver)
+    return usados
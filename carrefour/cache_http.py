@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Cache em disco do caminho HTTP, por (URL, região). Guarda só o que importa da
+página — os blocos ld+json — e os validadores da resposta (ETag/Last-Modified):
+
+    - dentro da validade (CARREFOUR_HTTP_CACHE_TTL_H): nenhuma requisição
+      (rodar de novo no mesmo dia sai quase de graça)
+    - vencido: GET condicional (If-None-Match/If-Modified-Since); 304 devolve o
+      ld+json guardado e renova a validade, 200 baixa a página de novo
+    - no máximo CARREFOUR_HTTP_CACHE_MAX entradas; poda LRU (pelo mtime do
+      arquivo, tocado a cada uso)
+
+    .cache/http<sufixo>/<sha1(região|url)>.json
+
+CARREFOUR_HTTP_CACHE=0 desliga.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from carrefour.urls import CACHE_DIR, SUFIXO_CACHE
+
+ATIVO = os.environ.get("CARREFOUR_HTTP_CACHE", "1") not in ("0", "false", "no")
+TTL_H = float(os.environ.get("CARREFOUR_HTTP_CACHE_TTL_H", "6"))
+MAX_ENTRADAS = int(os.environ.get("CARREFOUR_HTTP_CACHE_MAX", "5000"))
+
+
+class CacheHttp:
+    def __init__(self, pasta: str = os.path.join(CACHE_DIR, f"http{SUFIXO_CACHE}"),
+                 ttl_h: float = TTL_H, max_entradas: int = MAX_ENTRADAS):
+        self.pasta = pasta
+        self.ttl = ttl_h * 3600
+        self.max_entradas = max_entradas
+        self._lock = threading.Lock()
+        self.contagem = Counter()   # fresca / 304 / baixada
+
+    def contar(self, desfecho: str):
+        with self._lock:
+            self.contagem[desfecho] += 1
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return dict(self.contagem)
+
+    def _arquivo(self, url: str, regiao) -> str:
+        chave = hashlib.sha1(f"{regiao or ''}|{url}".encode("utf-8")).hexdigest()
+        return os.path.join(self.pasta, f"{chave}.json")
+
+    def ler(self, url: str, regiao=None):
+        """Entrada guardada {blocos, etag, last_modified, salvo_em} ou None."""
+        caminho = self._arquivo(url, regiao)
+        try:
+            with open(caminho, encoding="utf-8") as fh:
+                entrada = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(caminho)   # LRU: uso recente
+        except OSError:
+            pass
+        return entrada
+
+    def fresca(self, entrada) -> bool:
+        return entrada is not None and time.time() - entrada.get("salvo_em", 0) <= self.ttl
+
+    def validadores(self, entrada) -> dict:
+        """Cabeçalhos do GET condicional para uma entrada vencida."""
+        cabecalhos = {}
+        if entrada and entrada.get("etag"):
+            cabecalhos["If-None-Match"] = entrada["etag"]
+        if entrada and entrada.get("last_modified"):
+            cabecalhos["If-Modified-Since"] = entrada["last_modified"]
+        return cabecalhos
+
+    def gravar(self, url: str, regiao, blocos, etag=None, last_modified=None):
+        os.makedirs(self.pasta, exist_ok=True)
+        caminho = self._arquivo(url, regiao)
+        entrada = {
+            "url": url, "regiao": regiao, "blocos": blocos,
+            "etag": etag, "last_modified": last_modified, "salvo_em": time.time(),
+        }
+        tmp = f"{caminho}.{os.getpid()}.{id(entrada)}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(entrada, fh, ensure_ascii=False)
+        os.replace(tmp, caminho)
+
+    def renovar(self, url: str, regiao, entrada: dict):
+        """304: o conteúdo guardado continua valendo por mais um TTL."""
+        self.gravar(url, regiao, entrada["blocos"], entrada.get("etag"), entrada.get("last_modified"))
+
+    def podar(self) -> int:
+        """Remove as entradas menos usadas além de max_entradas; devolve quantas saíram."""
+        try:
+            nomes = [n for n in os.listdir(self.pasta) if n.endswith(".json")]
+        except OSError:
+            return 0
+        excesso = len(nomes) - self.max_entradas
+        if excesso <= 0:
+            return 0
+        caminhos = sorted(
+            (os.path.join(self.pasta, n) for n in nomes),
+            key=lambda c: os.path.getmtime(c) if os.path.exists(c) else 0,
+        )
+        removidas = 0
+        for caminho in caminhos[:excesso]:
+            try:
+                os.remove(caminho)
+                removidas += 1
+            except OSError:
+                pass
+        print(f"🧹 Cache HTTP: {removidas} entrada(s) antiga(s) removida(s).")
+        return removidas
+
+
+CACHE_HTTP = CacheHttp() if ATIVO else None
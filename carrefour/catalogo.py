@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Descoberta do catálogo pelo sitemap do site e lista de trabalho canônica.
+O sitemap (índice -> sitemaps de produto) vira um índice local SKU -> URL em
+.cache/catalogo.json, renovado a cada CARREFOUR_CATALOGO_VALIDADE_DIAS; se a
+descoberta falhar, vale o último catálogo bom e o sitemap só é tentado de novo
+depois de CARREFOUR_CATALOGO_ESPERA_FALHA_H horas.
+A lista de trabalho é deduplicada por SKU (a URL repetida da linguiça some) e
+usa a URL atual do catálogo quando o slug mudou. Páginas /busca/ não têm
+Product: vão para o fim da lista e são lidas como listagem (ItemList),
+rendendo um registro por produto mostrado (CARREFOUR_LISTAGENS=0 desliga).
+
+    CARREFOUR_CATALOGO=lista    (padrão) só os produtos de carrefour/urls.py
+    CARREFOUR_CATALOGO=sitemap  todos os produtos do catálogo descoberto
+
+    python -m carrefour.catalogo     # renova o catálogo e mostra os totais
+"""
+
+import json
+import os
+import time
+import xml.etree.ElementTree as ET
+
+from carrefour.browser import HOME
+from carrefour.http_fetch import build_session
+from carrefour.urls import CACHE_DIR, SUFIXO_CACHE, URLS, chave_produto, eh_produto
+
+MODO = os.environ.get("CARREFOUR_CATALOGO", "lista").lower()
+LISTAGENS = os.environ.get("CARREFOUR_LISTAGENS", "1") not in ("0", "false", "no")
+VALIDADE_DIAS = float(os.environ.get("CARREFOUR_CATALOGO_VALIDADE_DIAS", "7"))
+# depois de uma descoberta que falhou, espera isso antes de percorrer o sitemap de novo
+ESPERA_FALHA_H = float(os.environ.get("CARREFOUR_CATALOGO_ESPERA_FALHA_H", "6"))
+SITEMAP = HOME + "sitemap.xml"
+ARQUIVO = os.path.join(CACHE_DIR, f"catalogo{SUFIXO_CACHE}.json")
+
+
+def _locs(session, url: str, timeout: float) -> tuple:
+    """(é índice?, [loc, ...]) de um sitemap."""
+    resp = session.get(url, timeout=timeout)
+    resp.raise_for_status()
+    raiz = ET.fromstring(resp.content)
+    locs = [el.text.strip() for el in raiz.iter() if el.tag.endswith("loc") and el.text]
+    return raiz.tag.endswith("sitemapindex"), locs
+
+
+def descobrir(session=None, sitemap: str = SITEMAP, timeout: float = 30.0) -> dict:
+    """Percorre o sitemap (e os sitemaps filhos de produto); devolve {sku: url}."""
+    session = session or build_session()
+    produtos = {}
+    pendentes = [sitemap]
+    while pendentes:
+        url = pendentes.pop(0)
+        try:
+            indice, locs = _locs(session, url, timeout)
+        except Exception as e:
+            print(f"⚠️ Sitemap {url}:", e)
+            continue
+        if indice:
+            # só os filhos de produto (categorias, marcas e institucionais não interessam)
+            filhos = [u for u in locs if "product" in u.lower()]
+            pendentes.extend(filhos or locs)
+            continue
+        for loc in locs:
+            if eh_produto(loc):
+                produtos.setdefault(chave_produto(loc), loc)
+    return produtos
+
+
+def _ler_cache() -> dict:
+    try:
+        with open(ARQUIVO, encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def carregar_catalogo(vencido: bool = False) -> dict:
+    """{sku: url} do cache, ou {} se não existir/estiver vencido (vencido=True aceita o velho)."""
+    dados = _ler_cache()
+    if not vencido and time.time() - dados.get("gerado_em", 0) > VALIDADE_DIAS * 86400:
+        return {}
+    return dados.get("produtos", {})
+
+
+def salvar_catalogo(produtos: dict, gerado_em=None, falhou_em=None):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = ARQUIVO + ".tmp"
+    dados = {"gerado_em": time.time() if gerado_em is None else gerado_em, "produtos": produtos}
+    if falhou_em is not None:
+        dados["falhou_em"] = falhou_em
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(dados, fh, ensure_ascii=False)
+    os.replace(tmp, ARQUIVO)
+
+
+def catalogo(renovar: bool = False) -> dict:
+    """
+    Catálogo em cache; só percorre o sitemap quando vencido (ou renovar=True).
+    Se a descoberta falhar, fica com o último catálogo bom (mesmo vencido) e
+    não tenta de novo por CARREFOUR_CATALOGO_ESPERA_FALHA_H horas. {} se nunca houve.
+    """
+    dados = _ler_cache()
+    produtos = dados.get("produtos", {})
+    if not renovar:
+        if produtos and time.time() - dados.get("gerado_em", 0) <= VALIDADE_DIAS * 86400:
+            return produtos
+        if time.time() - dados.get("falhou_em", 0) <= ESPERA_FALHA_H * 3600:
+            return produtos
+    novos = descobrir()
+    if novos:
+        salvar_catalogo(novos)
+        print(f"🗂️ Catálogo descoberto: {len(novos)} produto(s).")
+        return novos
+    print(f"⚠️ Descoberta do catálogo falhou; usando o último catálogo ({len(produtos)} produto(s)).")
+    salvar_catalogo(produtos, gerado_em=dados.get("gerado_em", 0), falhou_em=time.time())
+    return produtos
+
+
+def lista_trabalho(urls=URLS, modo: str = MODO) -> list:
+    """
+    URLs de produto a coletar, uma por SKU, na ordem de `urls` (modo "lista")
+    ou de todo o catálogo (modo "sitemap"). Sem catálogo, usa as URLs como estão.
+    As páginas de listagem de `urls` vêm no fim (sem repetição).
+    """
+    cat = catalogo()
+    listagens = list(dict.fromkeys(u for u in urls if not eh_produto(u))) if LISTAGENS else []
+    if modo == "sitemap" and cat:
+        return list(cat.values()) + listagens
+    vistos = {}
+    for url in urls:
+        if eh_produto(url):
+            sku = chave_produto(url)
+            vistos.setdefault(sku, cat.get(sku, url))
+    return list(vistos.values()) + listagens
+
+
+if __name__ == "__main__":
+    cat = catalogo(renovar=True)
+    lista = lista_trabalho(modo="lista")
+    print(f"{len(cat)} produto(s) no catálogo; {len(lista)} URL(s) na lista de trabalho "
+          f"({len(URLS)} URLs em carrefour/urls.py).")
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Registro declarativo das cidades (carrefour/cidades.json).
+Adicionar uma cidade = uma linha no JSON; runner, scripts e workflow leem daqui.
+CARREFOUR_CIDADES aponta para outro arquivo, se preciso. Uso:
+
+    python -m carrefour.cidades     # lista as pastas de dados (usado no workflow)
+"""
+
+import json
+import os
+from dataclasses import dataclass
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARQUIVO = os.environ.get(
+    "CARREFOUR_CIDADES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cidades.json")
+)
+
+
+@dataclass(frozen=True)
+class Alvo:
+    chave: str
+    cidade: str
+    cep: str | None     # None = sem fixar localização (SP)
+    data_dir: str       # relativo à raiz do repo
+    sufixo: str = ""    # precos_carrefour_<sufixo>-YYYY-MM.xlsx
+    historico: bool = True
+    coluna_cidade: bool = True  # False: registros sem a coluna "Cidade" (formato antigo de SP)
+
+
+def carregar_cidades(caminho: str = ARQUIVO) -> list:
+    with open(caminho, encoding="utf-8") as fh:
+        return [Alvo(**c) for c in json.load(fh)]
+
+
+ALVOS = carregar_cidades()
+
+
+def alvo(chave: str) -> Alvo:
+    for a in ALVOS:
+        if a.chave == chave:
+            return a
+    raise KeyError(f"cidade desconhecida: {chave}")
+
+
+if __name__ == "__main__":
+    print("\n".join(a.data_dir for a in ALVOS))
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Coleta de uma cidade (síncrona): o antigo main() dos scripts, parametrizado
+pelo registro de cidades. Os scraper_carrefour*.py só chamam executar(<chave>).
+"""
+
+import os
+import time
+from datetime import datetime
+from functools import partial
+
+from carrefour.browser import build_driver
+from carrefour.cache_http import CACHE_HTTP
+from carrefour.catalogo import lista_trabalho
+from carrefour.cidades import BASE_DIR, Alvo, alvo as alvo_por_chave
+from carrefour.diario import Diario, dias_pendentes
+from carrefour.http_fetch import (
+    FETCH_MODE, build_session, capturar_cookies, coletar_http_com_fallback,
+)
+from carrefour.ldjson import DECODER
+from carrefour.metricas import ETAPAS, salvar_relatorio
+from carrefour.parquet_store import EXPORTAR_EXCEL, gravar_dia, ler
+from carrefour.pool import POOL_SIZE, coletar_em_pool
+from carrefour.rede import REDE
+from carrefour.regiao import fixar_regiao
+from carrefour.retentativas import Agendador
+from carrefour.saude import SaudeUrls
+from carrefour.scrape import registros_finais, scrape_via_http, scrape_via_json, vazio
+from carrefour.storage import arquivos_mensais, salvar_mensal
+from carrefour.supervisor import RECICLAGENS
+from carrefour.wait import TEMPOS
+
+
+def pasta_dados(alvo: Alvo) -> str:
+    data_dir = os.path.join(BASE_DIR, alvo.data_dir)
+    os.makedirs(data_dir, exist_ok=True)
+    return data_dir
+
+
+def salvar_cidade(alvo: Alvo, registros, hoje: datetime):
+    """Parquet do dia (armazenamento principal) + Excel mensal opcional."""
+    data_dir = pasta_dados(alvo)
+    gravar_dia(registros, data_dir, hoje.strftime("%Y-%m-%d"), cidade=alvo.cidade)
+    if EXPORTAR_EXCEL:
+        arq_mensal, arq_erros = arquivos_mensais(data_dir, alvo.sufixo, hoje.strftime("%Y-%m"))
+        salvar_mensal(registros, arq_mensal, arq_erros, f"Preço_{hoje.strftime('%Y%m%d')}",
+                      hoje.strftime("%Y-%m-%d"), historico=alvo.historico)
+
+
+def recuperar_diarios(alvo: Alvo, hoje: datetime):
+    """
+    Diários de dias anteriores (execução que caiu sem nova rodada no dia): o
+    que foi coletado vai para o dia dele nos armazenamentos e o diário sai.
+    Se o dia já foi gravado (caiu depois de salvar), o diário só é descartado.
+    """
+    data_dir = pasta_dados(alvo)
+    for data_str in dias_pendentes(data_dir, hoje.strftime("%Y-%m-%d")):
+        diario = Diario(data_dir, data_str)
+        por_url = diario.resultados()
+        gravado = any(not ler(data_dir, t, data_str, data_str).empty for t in ("precos", "erros"))
+        if por_url and not gravado:
+            print(f"📒 [{alvo.chave}] Gravando o diário de {data_str}: {len(por_url)} URL(s).")
+            salvar_cidade(alvo, registros_finais(list(por_url), por_url), datetime.strptime(data_str, "%Y-%m-%d"))
+        diario.compactar()
+
+
+def relatorio(alvo: Alvo, registros, hoje: datetime, inicio: float) -> dict:
+    """Relatório JSON da execução: totais, etapas (p50/p95/máx), prontidão, rede e reciclagens de driver."""
+    precos = sum(1 for r in registros if r["Preço"] > 0)
+    return {
+        "cidade": alvo.cidade,
+        "chave": alvo.chave,
+        "data": hoje.strftime("%Y-%m-%d"),
+        "inicio": hoje.isoformat(timespec="seconds"),
+        "duracao_s": round(time.monotonic() - inicio, 1),
+        "fetch_mode": FETCH_MODE,
+        "json": DECODER,
+        "pool_size": POOL_SIZE,
+        "registros": len(registros),
+        "precos": precos,
+        "erros": len(registros) - precos,
+        "etapas": ETAPAS.estatisticas(),
+        "pronto": TEMPOS.estatisticas(),
+        "rede": REDE.estatisticas(),
+        "reciclagens": RECICLAGENS.estatisticas(),
+        "cache_http": CACHE_HTTP.estatisticas() if CACHE_HTTP is not None else None,
+    }
+
+
+def coletar_cidade(alvo: Alvo, urls=None, hoje: datetime | None = None, diario: Diario | None = None) -> list:
+    hoje = hoje or datetime.now()
+    # URLs mortas há dias ficam em backoff (carrefour/saude.py)
+    saude = SaudeUrls(pasta_dados(alvo), alvo.cep, alvo.cidade if alvo.coluna_cidade else None)
+    urls = saude.filtrar(lista_trabalho() if urls is None else urls, hoje.date())
+    # o que já saiu hoje (execução anterior interrompida) não é coletado de novo
+    diario = diario or Diario(pasta_dados(alvo), hoje.strftime("%Y-%m-%d"))
+    por_url = diario.feitos()
+    pendentes = [u for u in urls if u not in por_url]
+    if pendentes:
+        por_url.update(_coletar_pendentes(alvo, pendentes, diario))
+    saude.registrar({u: por_url[u] for u in pendentes}, hoje.strftime("%Y-%m-%d"))
+    saude.salvar()
+
+    # páginas de produto + produtos lidos nas listagens (/busca/)
+    return registros_finais(urls, por_url)
+
+
+def _coletar_pendentes(alvo: Alvo, urls, diario: Diario) -> dict:
+    tag = alvo.cidade if alvo.coluna_cidade else None
+    fix = partial(fixar_regiao, cep=alvo.cep) if alvo.cep else None
+    novo_driver = partial(build_driver, headless=True)
+
+    # 1) HTTP direto com os cookies regionais (capturados uma vez no Chrome)
+    session = None
+    if FETCH_MODE == "http":
+        cookies = capturar_cookies(novo_driver, fix)
+        if cookies is not None:
+            session = build_session(cookies, pool_size=POOL_SIZE, regiao=alvo.cep)
+
+    # 2) Chrome só para o que faltou: pool de drivers (CARREFOUR_POOL_SIZE), CEP já fixado
+    #    cada resultado vai para o diário assim que sai
+    chrome = partial(
+        coletar_em_pool,
+        build_driver=novo_driver,
+        scrape=diario.anotando(partial(scrape_via_json, cidade=tag)),
+        workers=POOL_SIZE,
+        fix_location=fix,
+        registro_vazio=partial(vazio, cidade=tag),
+        chave_falha=lambda u: (u, tag),
+    )
+    resultados = coletar_http_com_fallback(
+        urls, session, diario.anotando(partial(scrape_via_http, cidade=tag)), workers=POOL_SIZE,
+        fallback=chrome,
+    )
+    # 3) falhas vão para a fila adiada: novas rodadas no Chrome, com backoff (carrefour/retentativas.py)
+    return Agendador().segunda_passada(dict(zip(urls, resultados)), chrome, lambda u: (u, tag))
+
+
+def executar(chave: str):
+    alvo = alvo_por_chave(chave)
+    hoje = datetime.now()
+    t0 = time.monotonic()
+    recuperar_diarios(alvo, hoje)
+    diario = Diario(pasta_dados(alvo), hoje.strftime("%Y-%m-%d"))
+    registros = coletar_cidade(alvo, hoje=hoje, diario=diario)
+    print(TEMPOS.resumo())
+    print(REDE.resumo())
+    salvar_cidade(alvo, registros, hoje)
+    diario.compactar()
+    if CACHE_HTTP is not None:
+        CACHE_HTTP.podar()
+    print(ETAPAS.resumo())
+    salvar_relatorio(pasta_dados(alvo), hoje.strftime("%Y-%m-%d"), relatorio(alvo, registros, hoje, t0))
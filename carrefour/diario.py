@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Diário (write-ahead) da coleta do dia, por cidade: cada resultado é gravado em
+<data_dir>/parquet/diario_YYYY-MM-DD.jsonl assim que chega. Se o processo cair
+no meio, rodar de novo no mesmo dia retoma só as URLs que faltam (ou falharam); depois que o
+Parquet/Excel do dia são gravados, o diário é compactado (removido).
+Fica dentro de parquet/ para ir junto no commit do workflow mesmo em falha.
+Diário de um dia anterior (a execução caiu e ninguém rodou de novo no dia) é
+gravado no dia dele na próxima execução (dias_pendentes + resultados).
+"""
+
+import glob
+import json
+import os
+import threading
+
+from carrefour.retentativas import falhou
+
+
+class Diario:
+    def __init__(self, data_dir: str, data_str: str):
+        self.caminho = os.path.join(data_dir, "parquet", f"diario_{data_str}.jsonl")
+        self._lock = threading.Lock()
+        self._fh = None
+
+    def _itens(self):
+        # linha final truncada (processo morto no meio da escrita) é ignorada
+        with open(self.caminho, encoding="utf-8") as fh:
+            for linha in fh:
+                try:
+                    yield json.loads(linha)
+                except ValueError:
+                    continue
+
+    def feitos(self) -> dict:
+        """
+        {url: resultado} que já deram certo hoje (linha final truncada é ignorada).
+        Falhas anotadas ("Não encontrado", listagem vazia) não contam: voltam
+        para a fila na retomada.
+        """
+        feitos = {}
+        try:
+            for item in self._itens():
+                if not falhou(item["resultado"]):
+                    feitos[item["url"]] = item["resultado"]
+        except OSError:
+            return {}
+        if feitos:
+            print(f"📒 Retomando do diário: {len(feitos)} URL(s) já coletadas hoje.")
+        return feitos
+
+    def resultados(self) -> dict:
+        """{url: último resultado} anotado, falhas incluídas (recuperação de dia anterior)."""
+        por_url = {}
+        try:
+            for item in self._itens():
+                por_url[item["url"]] = item["resultado"]
+        except OSError:
+            return {}
+        return por_url
+
+    def anotar(self, url: str, resultado):
+        if resultado is None:
+            return
+        linha = json.dumps({"url": url, "resultado": resultado}, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._fh is None:
+                os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+                self._fh = open(self.caminho, "a", encoding="utf-8")
+            self._fh.write(linha)
+            self._fh.flush()
+
+    def anotando(self, scrape):
+        """Envolve scrape(url, ...) para anotar cada resultado assim que sai."""
+        def _scrape(url, *args, **kwargs):
+            resultado = scrape(url, *args, **kwargs)
+            self.anotar(url, resultado)
+            return resultado
+        return _scrape
+
+    def compactar(self):
+        """Chamado depois que o dia foi gravado nos armazenamentos: descarta o diário."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            try:
+                os.remove(self.caminho)
+            except OSError:
+                pass
+
+
+def dias_pendentes(data_dir: str, data_str: str) -> list:
+    """Datas (YYYY-MM-DD) anteriores a data_str que ainda têm diário em parquet/."""
+    dias = []
+    for caminho in glob.glob(os.path.join(data_dir, "parquet", "diario_*.jsonl")):
+        dia = os.path.basename(caminho)[len("diario_"):-len(".jsonl")]
+        if dia < data_str:
+            dias.append(dia)
+    return sorted(dias)
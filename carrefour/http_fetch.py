@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Caminho HTTP (sem navegador) para ler o JSON-LD das páginas de produto.
+- sessão keep-alive com gzip (requests.Session)
+- cookies regionais capturados uma única vez via Chrome (fix_location)
+- HTML lido em streaming; o parse para assim que o bloco Product aparece e o
+  resto da resposta é drenado (até CARREFOUR_HTTP_DRENAR_KB) para a conexão
+  voltar ao pool keep-alive; cauda maior que isso: a conexão é fechada
+  (reabrir sai mais barato que baixar a página inteira)
+- cache em disco por (URL, região) com GET condicional (carrefour/cache_http.py)
+O Chrome fica só como fallback para as URLs em que o HTTP não achou Product.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from carrefour.cache_http import CACHE_HTTP
+from carrefour.ldjson import product_from_blocks
+from carrefour.metricas import ETAPAS
+
+# "http" (padrão): tenta HTTP e cai no Chrome; "chrome": só navegador
+FETCH_MODE = os.environ.get("CARREFOUR_FETCH_MODE", "http").lower()
+
+# quanto do resto da página ainda vale ler para reaproveitar a conexão (KB)
+DRENAR_KB = float(os.environ.get("CARREFOUR_HTTP_DRENAR_KB", "256"))
+
+# último status HTTP por (região, URL) (índice de saúde, carrefour/saude.py)
+STATUS = {}
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.6",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+
+class LdJsonParser(HTMLParser):
+    """
+    Parser incremental: guarda apenas o conteúdo dos
+    <script type="application/ld+json"> (um item por bloco fechado).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocos = []
+        self._buf = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script" and (dict(attrs).get("type") or "").lower() == "application/ld+json":
+            self._buf = []
+
+    def handle_data(self, data):
+        if self._buf is not None:
+            self._buf.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "script" and self._buf is not None:
+            self.blocos.append("".join(self._buf))
+            self._buf = None
+
+
+@ETAPAS.cronometrar("capturar_cookies")
+def capturar_cookies(build_driver, fix_location=None) -> list:
+    """
+    Abre um Chrome, fixa a localização e devolve os cookies (contexto regional).
+    Sem fix_location (SP) não há contexto a capturar: retorna lista vazia.
+    Retorna None se a captura falhar (o chamador deve ir direto para o Chrome).
+    """
+    if fix_location is None:
+        return []
+    try:
+        driver = build_driver()
+    except Exception as e:
+        print("❌ Falha ao abrir o driver para capturar cookies:", e)
+        return None
+    try:
+        fix_location(driver)
+        return driver.get_cookies()
+    except Exception as e:
+        print("⚠️ Falha ao capturar cookies regionais:", e)
+        return None
+    finally:
+        driver.quit()
+
+
+def build_session(cookies=None, pool_size: int = 8, regiao=None) -> requests.Session:
+    """Sessão keep-alive; `regiao` (CEP dos cookies) entra na chave do cache HTTP."""
+    session = requests.Session()
+    session.regiao = regiao
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    for c in cookies or []:
+        session.cookies.set(
+            c["name"], c["value"],
+            domain=c.get("domain"), path=c.get("path", "/"),
+        )
+    return session
+
+
+@ETAPAS.cronometrar("http_get")
+def fetch_ldjson(session: requests.Session, url: str, timeout: float = 20.0,
+                 ate_produto: bool = True, cache=CACHE_HTTP) -> list:
+    """
+    Baixa o HTML em streaming e devolve os blocos ld+json encontrados.
+    Para de analisar quando um bloco com Product já foi lido (ate_produto=False
+    lê a página inteira: listagens); a cauda é drenada sem parse até DRENAR_KB,
+    para a conexão voltar ao pool, e acima disso a conexão é descartada.
+    Com cache: entrada fresca não faz requisição; vencida vira GET condicional
+    e o 304 devolve os blocos guardados. Só guarda páginas que renderam
+    Product (ou, nas listagens, algum bloco).
+    """
+    regiao = getattr(session, "regiao", None)
+    entrada = cache.ler(url, regiao) if cache is not None else None
+    if cache is not None and cache.fresca(entrada):
+        cache.contar("fresca")
+        return entrada["blocos"]
+
+    parser = LdJsonParser()
+    cabecalhos = cache.validadores(entrada) if cache is not None else {}
+    with session.get(url, timeout=timeout, stream=True, headers=cabecalhos) as resp:
+        STATUS[(regiao, url)] = resp.status_code
+        if resp.status_code == 304 and entrada is not None:
+            cache.contar("304")
+            cache.renovar(url, regiao, entrada)
+            return entrada["blocos"]
+        resp.raise_for_status()
+        validadores = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        if "charset" not in resp.headers.get("Content-Type", "").lower():
+            resp.encoding = "utf-8"
+        vistos, achou, drenados = 0, False, 0
+        for chunk in resp.iter_content(chunk_size=16384, decode_unicode=True):
+            if achou:
+                drenados += len(chunk)
+                if drenados > DRENAR_KB * 1024:
+                    break   # cauda grande: fechar a conexão (no fim do with) sai mais barato
+                continue
+            parser.feed(chunk)
+            if ate_produto and len(parser.blocos) > vistos:
+                achou = product_from_blocks(parser.blocos[vistos:]) is not None
+                vistos = len(parser.blocos)
+    if cache is not None:
+        cache.contar("baixada")
+        if parser.blocos and (not ate_produto or product_from_blocks(parser.blocos) is not None):
+            cache.gravar(url, regiao, parser.blocos, *validadores)
+    return parser.blocos
+
+
+def coletar_http_com_fallback(urls, session, scrape_http, fallback, workers: int = 4) -> list:
+    """
+    Roda scrape_http(url, session) para cada URL (em threads, mesma sessão);
+    as URLs que voltarem None vão para fallback(pendentes) -> lista de registros.
+    Com session None, tudo vai direto para o fallback.
+    Resultado na mesma ordem de `urls`.
+    """
+    urls = list(urls)
+    por_url = {}
+    if session is not None and urls:
+        unicas = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+            for url, reg in zip(unicas, ex.map(lambda u: scrape_http(u, session), unicas)):
+                if reg is not None:
+                    por_url[url] = reg
+
+    pendentes = list(dict.fromkeys(u for u in urls if u not in por_url))
+    if pendentes:
+        print(f"\n🧭 {len(pendentes)} URL(s) sem Product via HTTP — usando Chrome.")
+        for url, reg in zip(pendentes, fallback(pendentes)):
+            por_url[url] = reg
+    return [por_url[u] for u in urls]
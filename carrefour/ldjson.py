@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Leitura dos blocos JSON-LD (ld+json) das páginas de produto
+e das páginas de listagem (/busca/: ItemList com um Product por item).
+Mesma lógica para o caminho Chrome e para o caminho HTTP.
+
+Decodificador plugável (CARREFOUR_JSON): "auto" (padrão) usa orjson ou
+simdjson se estiverem instalados, senão o json da stdlib; "orjson",
+"simdjson" ou "json" forçam um. Antes de decodificar, um filtro barato
+descarta os blocos sem '"Product"' / '"ItemList"' (BreadcrumbList,
+Organization, WebSite...), como o script de espera já faz no navegador.
+"""
+
+import json
+import os
+
+from carrefour.metricas import ETAPAS
+# texto/número -> float (regex pré-compilada + memo): carrefour/precos.py
+from carrefour.precos import normalizar_preco as coerce_price
+
+JSON_BACKEND = os.environ.get("CARREFOUR_JSON", "auto").lower()
+
+
+def _decodificador(backend: str = JSON_BACKEND):
+    """(nome, loads) do backend pedido; cai no json da stdlib se não estiver instalado."""
+    if backend in ("auto", "orjson"):
+        try:
+            import orjson
+            return "orjson", orjson.loads
+        except ImportError:
+            pass
+    if backend in ("auto", "simdjson"):
+        try:
+            import simdjson
+            return "simdjson", simdjson.loads
+        except ImportError:
+            pass
+    return "json", json.loads
+
+
+DECODER, _loads = _decodificador()
+
+
+@ETAPAS.cronometrar("parse_jsonld")
+def parse_jsonld(raw: str):
+    """
+    Retorna uma lista de objetos (dicts) de JSON-LD a partir do raw.
+    Suporta único objeto, lista, e @graph.
+    """
+    try:
+        data = _loads(raw)
+    except Exception:
+        return []
+
+    objs = []
+    if isinstance(data, dict):
+        if "@graph" in data and isinstance(data["@graph"], list):
+            objs.extend([o for o in data["@graph"] if isinstance(o, dict)])
+        else:
+            objs.append(data)
+    elif isinstance(data, list):
+        objs.extend([o for o in data if isinstance(o, dict)])
+    return objs
+
+
+def _preco_offers(offers):
+    """Preço bruto de offers (dict ou lista; price, priceSpecification ou lowPrice)."""
+    # offers pode ser dict ou lista
+    if isinstance(offers, list):
+        offers = offers[0] if offers and isinstance(offers[0], dict) else {}
+    if not isinstance(offers, dict):
+        return None
+    return (
+        offers.get("price")
+        or (offers.get("priceSpecification") or {}).get("price")
+        or offers.get("lowPrice")
+    )
+
+
+def find_product(objs):
+    """
+    Procura o primeiro objeto @type == "Product" e devolve (nome, preço float).
+    Retorna None se não houver Product.
+    """
+    for obj in objs:
+        if obj.get("@type") != "Product":
+            continue
+        name = obj.get("name", "Não encontrado")
+        price = _preco_offers(obj.get("offers", {}))
+        return name, coerce_price(price)
+    return None
+
+
+def product_from_blocks(raws):
+    """Aplica find_product sobre uma lista de blocos ld+json brutos (str)."""
+    for raw in raws:
+        # filtro barato: só decodifica blocos que podem ter um Product
+        if not raw or '"Product"' not in raw:
+            continue
+        found = find_product(parse_jsonld(raw))
+        if found is not None:
+            return found
+    return None
+
+
+def find_listing(objs):
+    """
+    Itens de um ItemList (página de busca/categoria): [(nome, preço float, url), ...].
+    Aceita itemListElement com ListItem {item: Product} ou o Product direto.
+    """
+    itens = []
+    for obj in objs:
+        if obj.get("@type") != "ItemList":
+            continue
+        for el in obj.get("itemListElement") or []:
+            if not isinstance(el, dict):
+                continue
+            item = el.get("item") if isinstance(el.get("item"), dict) else el
+            if item.get("@type") not in (None, "Product"):
+                continue
+            url = item.get("url") or item.get("@id") or el.get("url")
+            if not url:
+                continue
+            itens.append((
+                item.get("name", "Não encontrado"),
+                coerce_price(_preco_offers(item.get("offers", {}))),
+                url,
+            ))
+    return itens
+
+
+def listing_from_blocks(raws):
+    """Aplica find_listing sobre todos os blocos ld+json brutos (str)."""
+    itens = []
+    for raw in raws:
+        if raw and '"ItemList"' in raw:
+            itens.extend(find_listing(parse_jsonld(raw)))
+    return itens
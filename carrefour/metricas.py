@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentação por etapa (build_driver, fix_location, driver.get, espera/extração
+do ld+json, parse_jsonld, HTTP, Parquet, Excel) e relatório JSON da execução.
+Cada etapa acumula as durações; o resumo traz n, p50, p95, máx e total.
+O relatório fica ao lado dos dados: <data_dir>/relatorios/execucao_YYYY-MM-DD.json
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+def percentis(valores) -> dict:
+    """{n, p50, p95, max, total} de uma lista de durações (s); {} se vazia."""
+    v = sorted(valores)
+    if not v:
+        return {}
+    return {
+        "n": len(v),
+        "p50": round(v[len(v) // 2], 4),
+        "p95": round(v[min(len(v) - 1, int(len(v) * 0.95))], 4),
+        "max": round(v[-1], 4),
+        "total": round(sum(v), 3),
+    }
+
+
+class Etapas:
+    """Durações por etapa (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.duracoes = {}
+
+    def registrar(self, etapa: str, segundos: float):
+        with self._lock:
+            self.duracoes.setdefault(etapa, []).append(segundos)
+
+    @contextmanager
+    def medir(self, etapa: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - t0)
+
+    def cronometrar(self, etapa: str):
+        """Decorador: mede cada chamada da função como `etapa`."""
+        def decorador(fn):
+            @functools.wraps(fn)
+            def medido(*args, **kwargs):
+                with self.medir(etapa):
+                    return fn(*args, **kwargs)
+            return medido
+        return decorador
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            copia = {k: list(v) for k, v in self.duracoes.items()}
+        return {k: percentis(v) for k, v in sorted(copia.items())}
+
+    def resumo(self) -> str:
+        linhas = ["📊 Etapas (n · p50 · p95 · máx · total):"]
+        for etapa, e in self.estatisticas().items():
+            linhas.append(
+                f"   {etapa:<18} {e['n']:>5} · {e['p50']:.3f}s · {e['p95']:.3f}s · "
+                f"{e['max']:.3f}s · {e['total']:.1f}s"
+            )
+        return "\n".join(linhas)
+
+
+ETAPAS = Etapas()
+
+
+def salvar_relatorio(data_dir: str, data_str: str, dados: dict) -> str:
+    """Grava o relatório da execução (JSON) em <data_dir>/relatorios/."""
+    pasta = os.path.join(data_dir, "relatorios")
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"execucao_{data_str}.json")
+    tmp = caminho + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(dados, fh, ensure_ascii=False, indent=2)
+    os.replace(tmp, caminho)
+    print(f"🧾 Relatório da execução: {caminho}")
+    return caminho
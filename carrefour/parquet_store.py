@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+Armazenamento principal: Parquet colunar, só-acréscimo, particionado por dia.
+
+    <data_dir>/parquet/precos/data=YYYY-MM-DD/part.parquet   (1 linha por produto)
+    <data_dir>/parquet/erros/data=YYYY-MM-DD/part.parquet    (URLs sem preço)
+
+Cada execução grava apenas as partições do dia (O(linhas de hoje)); rodar de
+novo no mesmo dia substitui as duas. As partições formam o histórico longo
+(data, cidade, produto, url, nome, preco), só-acréscimo; `produto` é o SKU da
+URL (chave_produto), a chave de dedup, do índice e do pivot. Ao lado fica um
+índice por produto para consultas do tipo "preço de X nos últimos N dias" sem
+ler/derreter o mês inteiro:
+
+    <data_dir>/parquet/indice_produtos.json         {produto: {YYYY-MM-DD: preco}}
+    <data_dir>/parquet/indice_dias/YYYY-MM-DD.json  {produto: preco}  (lote do dia)
+
+Cada execução grava só o lote do dia; os lotes são compactados na base uma vez
+por mês (COMPACTAR_DIAS), então o custo por execução não cresce com o histórico.
+
+Os Excel mensais passam a ser exportação opcional (CARREFOUR_EXCEL=0 desliga).
+Para regenerar um mês inteiro a partir do Parquet:
+
+    python -m carrefour.parquet_store data_bh 2025-09 bh
+"""
+
+import glob
+import json
+import os
+import sys
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+
+from carrefour.metricas import ETAPAS
+from carrefour.urls import chave_produto
+
+# exportação Excel ligada por padrão (os .xlsx continuam sendo commitados)
+EXPORTAR_EXCEL = os.environ.get("CARREFOUR_EXCEL", "1") not in ("0", "false", "no")
+# lotes diários do índice acumulados antes de compactar na base
+COMPACTAR_DIAS = 31
+
+
+def _particao(data_dir: str, tabela: str, data_str: str) -> str:
+    return os.path.join(data_dir, "parquet", tabela, f"data={data_str}", "part.parquet")
+
+
+def _gravar(df: pd.DataFrame, caminho: str):
+    """Grava a partição; lote vazio remove a partição antiga (não fica dado velho do dia)."""
+    if df.empty:
+        try:
+            os.remove(caminho)
+        except OSError:
+            pass
+        return
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tmp = caminho + ".tmp"
+    df.to_parquet(tmp, index=False, engine="pyarrow")
+    os.replace(tmp, caminho)
+
+
+@ETAPAS.cronometrar("parquet")
+def gravar_dia(registros, data_dir: str, data_str: str, cidade=None):
+    """
+    Grava as duas partições do dia, preços (> 0) e erros, sempre juntas: uma
+    rodada repetida substitui ambas (produto que voltou a ter preço sai de
+    erros). A data fica no caminho da partição, não dentro do arquivo.
+    Chave: SKU do produto (coluna produto).
+    """
+    df = pd.DataFrame(registros)
+    if df.empty:
+        return
+    if cidade is None:
+        cidade = df["Cidade"] if "Cidade" in df.columns else ""
+    df = pd.DataFrame({
+        "cidade": cidade,
+        "produto": df["ID do Produto"] if "ID do Produto" in df.columns else df["URL"].map(chave_produto),
+        "url": df["URL"],
+        "nome": df["Nome do Produto"],
+        "preco": df["Preço"].astype("float64"),
+    }).drop_duplicates("produto", keep="last")
+
+    ok = df[df["preco"] > 0]
+    err = df[df["preco"] <= 0].drop(columns=["preco"])
+    _gravar(ok, _particao(data_dir, "precos", data_str))
+    _gravar(err, _particao(data_dir, "erros", data_str))
+    atualizar_indice(data_dir, data_str, ok)
+    print(f"🗃️ Parquet: {len(ok)} preço(s), {len(err)} erro(s) em {data_dir}/parquet (data={data_str})")
+
+
+def ler(data_dir: str, tabela: str = "precos", inicio=None, fim=None) -> pd.DataFrame:
+    """Lê as partições entre inicio e fim (YYYY-MM-DD, inclusivos) com a coluna data."""
+    partes = []
+    for caminho in sorted(glob.glob(os.path.join(data_dir, "parquet", tabela, "data=*", "part.parquet"))):
+        data_str = os.path.basename(os.path.dirname(caminho))[len("data="):]
+        if (inicio and data_str < inicio) or (fim and data_str > fim):
+            continue
+        parte = pd.read_parquet(caminho)
+        if "produto" not in parte.columns:
+            # partições gravadas antes da chave por SKU
+            parte.insert(1, "produto", parte["url"].map(chave_produto))
+        parte.insert(0, "data", data_str)
+        partes.append(parte)
+    if not partes:
+        return pd.DataFrame(columns=["data", "cidade", "produto", "url", "nome", "preco"])
+    return pd.concat(partes, ignore_index=True)
+
+
+def _arquivo_indice(data_dir: str) -> str:
+    return os.path.join(data_dir, "parquet", "indice_produtos.json")
+
+
+def _pasta_dias(data_dir: str) -> str:
+    return os.path.join(data_dir, "parquet", "indice_dias")
+
+
+def _gravar_json(caminho: str, dados: dict):
+    """Grava via arquivo temporário único + os.replace (leitor nunca vê arquivo pela metade)."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(dados, fh, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp, caminho)
+
+
+def _dias_pendentes(data_dir: str) -> list:
+    """[(data, {produto: preco}), ...] dos lotes diários ainda não compactados na base."""
+    dias = []
+    for caminho in sorted(glob.glob(os.path.join(_pasta_dias(data_dir), "*.json"))):
+        try:
+            with open(caminho, encoding="utf-8") as fh:
+                dias.append((os.path.basename(caminho)[:-len(".json")], json.load(fh)))
+        except (OSError, ValueError):
+            continue
+    return dias
+
+
+def carregar_indice(data_dir: str) -> dict:
+    """
+    Índice {produto: {data: preco}}: a base compactada + os lotes diários
+    (cada lote substitui o seu dia). Reconstruído das partições se não existir.
+    """
+    try:
+        with open(_arquivo_indice(data_dir), encoding="utf-8") as fh:
+            indice = json.load(fh)
+    except (OSError, ValueError):
+        indice = reconstruir_indice(data_dir)
+    # índices antigos eram por URL: converte as chaves para o SKU
+    if any("://" in k for k in indice):
+        convertido = {}
+        for k, pontos in indice.items():
+            convertido.setdefault(chave_produto(k), {}).update(pontos)
+        indice = convertido
+    for data_str, precos in _dias_pendentes(data_dir):
+        for pontos in indice.values():
+            pontos.pop(data_str, None)
+        for chave, preco in precos.items():
+            indice.setdefault(chave, {})[data_str] = preco
+    return {k: v for k, v in indice.items() if v}
+
+
+def reconstruir_indice(data_dir: str) -> dict:
+    """Refaz o índice lendo todas as partições de preços (uso raro: índice perdido)."""
+    indice = {}
+    df = ler(data_dir, "precos")
+    for chave, data_str, preco in zip(df["produto"], df["data"], df["preco"]):
+        indice.setdefault(chave, {})[data_str] = float(preco)
+    if indice:
+        _gravar_json(_arquivo_indice(data_dir), indice)
+    return indice
+
+
+def atualizar_indice(data_dir: str, data_str: str, ok: pd.DataFrame):
+    """
+    Grava só o lote do dia (O(produtos de hoje)) em parquet/indice_dias/<data>.json;
+    rodada repetida no dia substitui o lote. Com mais de COMPACTAR_DIAS lotes,
+    eles são incorporados à base (uma vez por mês, não a cada execução).
+    """
+    precos = {chave: float(preco) for chave, preco in zip(ok["produto"], ok["preco"])}
+    _gravar_json(os.path.join(_pasta_dias(data_dir), f"{data_str}.json"), precos)
+    if len(glob.glob(os.path.join(_pasta_dias(data_dir), "*.json"))) > COMPACTAR_DIAS:
+        compactar_indice(data_dir)
+
+
+def compactar_indice(data_dir: str):
+    """Incorpora os lotes diários à base e remove os lotes."""
+    dias = glob.glob(os.path.join(_pasta_dias(data_dir), "*.json"))
+    _gravar_json(_arquivo_indice(data_dir), carregar_indice(data_dir))
+    for caminho in dias:
+        os.remove(caminho)
+
+
+def serie(data_dir: str, chave: str, dias: int = 30, ate=None) -> list:
+    """[(data, preco), ...] do produto (SKU) nos últimos `dias` dias até `ate` (YYYY-MM-DD, padrão hoje)."""
+    fim = ate or date.today().isoformat()
+    inicio = (date.fromisoformat(fim) - timedelta(days=dias - 1)).isoformat()
+    pontos = carregar_indice(data_dir).get(chave, {})
+    return sorted((d, p) for d, p in pontos.items() if inicio <= d <= fim)
+
+
+def exportar_excel_mes(data_dir: str, stamp_month: str, arq_mensal: str, historico: bool = True):
+    """Regera o Excel do mês (aba Precos wide + Historico) só a partir do Parquet."""
+    df = ler(data_dir, "precos", inicio=f"{stamp_month}-01", fim=f"{stamp_month}-31")
+    if df.empty:
+        print(f"⚠️ Nenhuma partição Parquet para {stamp_month} em {data_dir}.")
+        return
+    df["coluna"] = "Preço_" + df["data"].str.replace("-", "", regex=False)
+    # nome mais recente de cada produto (pode ter sido renomeado no mês)
+    nomes = df.sort_values("data").groupby("produto")["nome"].last()
+    wide = df.pivot_table(index="produto", columns="coluna", values="preco", aggfunc="last")
+    wide.insert(0, "Nome do Produto", nomes.reindex(wide.index))
+    wide = wide.rename_axis("ID do Produto").reset_index()
+    wide.columns.name = None
+
+    with pd.ExcelWriter(arq_mensal, engine="openpyxl", mode="w") as w:
+        wide.to_excel(w, index=False, sheet_name="Precos")
+        if historico:
+            hist = df.rename(columns={
+                "cidade": "Cidade", "produto": "ID do Produto", "nome": "Nome do Produto",
+                "preco": "Preço", "url": "URL", "data": "Data",
+            })[["Cidade", "ID do Produto", "Nome do Produto", "Preço", "URL", "Data"]]
+            hist.to_excel(w, index=False, sheet_name="Historico")
+    print(f"📁 Exportado do Parquet: {arq_mensal}")
+
+
+if __name__ == "__main__":
+    from carrefour.storage import arquivos_mensais
+
+    if len(sys.argv) not in (3, 4):
+        print("uso: python -m carrefour.parquet_store <data_dir> <YYYY-MM> [sufixo]")
+        sys.exit(2)
+    pasta, mes = sys.argv[1], sys.argv[2]
+    sufixo = sys.argv[3] if len(sys.argv) == 4 else ""
+    arq, _ = arquivos_mensais(pasta, sufixo, mes)
+    exportar_excel_mes(pasta, mes, arq, historico=bool(sufixo))
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Pool de drivers Chrome para coletar as URLs em paralelo.
+Cada worker abre o próprio driver headless, fixa a localização uma única vez
+e consome URLs de uma fila compartilhada; os resultados voltam na ordem de entrada.
+"""
+
+import os
+import queue
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+from carrefour.retentativas import anotar_falha, classe_falha, falhou
+from carrefour.supervisor import SupervisorDriver
+
+# tamanho padrão do pool (sobrescrevível por variável de ambiente no Actions)
+POOL_SIZE = int(os.environ.get("CARREFOUR_POOL_SIZE", "4"))
+
+
+def coletar_em_pool(urls, build_driver, scrape, workers: int = POOL_SIZE,
+                    fix_location=None, registro_vazio=None, pausa: float = 0.0,
+                    chave_falha=lambda item: (item, None)) -> list:
+    """
+    Executa scrape(url, driver) para cada URL usando até `workers` drivers.
+    - build_driver(): cria um driver novo (um por worker)
+    - fix_location(driver): opcional, roda uma vez por driver antes da coleta
+      (e de novo quando o supervisor recicla o driver: carrefour/supervisor.py)
+    - registro_vazio(url): registro usado quando a URL falha com exceção
+      (ou quando nenhum driver conseguiu subir)
+    - chave_falha(item) -> (url, cidade): chave da classe de falha (carrefour/retentativas.py)
+    """
+    urls = list(urls)
+    resultados = [None] * len(urls)
+    if not urls:
+        return resultados
+
+    fila = queue.Queue()
+    for i, url in enumerate(urls):
+        fila.put((i, url))
+
+    def _worker(n: int):
+        try:
+            sup = SupervisorDriver(build_driver, preparar=fix_location, nome=f"pool {n}")
+        except Exception as e:
+            print(f"❌ [pool {n}] Falha ao abrir o driver:", e)
+            return
+        try:
+            while True:
+                try:
+                    i, url = fila.get_nowait()
+                except queue.Empty:
+                    return
+                chave = chave_falha(url)
+                t0 = time.monotonic()
+                try:
+                    resultados[i] = scrape(url, sup.driver)
+                except TimeoutException as e:
+                    # page_load_timeout estourado: conta no orçamento/backoff de timeout
+                    print(f"⌛ [pool {n}] Timeout em {url}:", e.msg)
+                    anotar_falha(chave[0], "timeout", chave[1])
+                except Exception as e:
+                    print(f"❌ [pool {n}] Erro em {url}:", e)
+                    anotar_falha(chave[0], "excecao", chave[1])
+                ruim = falhou(resultados[i]) and classe_falha(*chave) in ("timeout", "excecao")
+                sup.registrar(time.monotonic() - t0, ruim)
+                # driver inchado, lento ou travado: troca por um novo (CEP refixado pelo cache)
+                try:
+                    sup.verificar()
+                except Exception as e:
+                    print(f"❌ [pool {n}] Falha ao reabrir o driver:", e)
+                    return
+                if pausa:
+                    time.sleep(pausa)
+        finally:
+            sup.fechar()
+
+    n_workers = max(1, min(int(workers), len(urls)))
+    threads = [
+        threading.Thread(target=_worker, args=(n,), name=f"pool-{n}", daemon=True)
+        for n in range(n_workers)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    if registro_vazio is not None:
+        resultados = [r if r is not None else registro_vazio(u) for u, r in zip(urls, resultados)]
+    return resultados
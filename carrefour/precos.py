@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Normalização de preços (texto/número -> float), num lugar só:
+
+- normalizar_preco(valor): um valor; as formas comuns ("12.99", "R$ 12,99",
+  "R$ 1.299,90") saem por regex pré-compilada e o resultado dos textos fica
+  num memo LRU (os mesmos preços se repetem entre páginas e cidades)
+- normalizar_coluna(valores): uma coluna inteira de uma vez (pandas/NumPy),
+  para backfill de planilhas históricas
+
+Regras: ponto de milhar e vírgula decimal no formato brasileiro; "1.299"
+(3 casas depois do ponto) é milhar; o que não converte (ou não é finito:
+"nan", "inf") vira 0.0.
+
+    python -m carrefour.precos data_bh/precos_carrefour_bh-2025-09.xlsx   # renormaliza no lugar
+"""
+
+import math
+import re
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# "R$ 1.299,90", "4,79", "R$12,9"
+_RE_BR = re.compile(r"(?:R\$)?\s*(\d{1,3}(?:\.\d{3})+|\d+),(\d+)")
+# "12.99", "1399.90", "8" (3 casas depois do ponto = milhar: fica para o caminho geral)
+_RE_PONTO = re.compile(r"\d+(?:\.(?:\d{1,2}|\d{4,}))?")
+
+
+def _geral(s: str) -> float:
+    s = s.strip().replace("R$", "").replace("\u00a0", "").replace(" ", "")
+    if "," in s:
+        # formato brasileiro: ponto de milhar, vírgula decimal
+        s = s.replace(".", "").replace(",", ".")
+    elif s.count(".") == 1 and len(s.split(".")[1]) == 3:
+        # "1.299" -> milhar (preços têm 2 casas decimais)
+        s = s.replace(".", "")
+    try:
+        v = float(s)
+    except Exception:
+        return 0.0
+    # float() aceita "nan", "inf", "infinity": não são preço
+    return v if math.isfinite(v) else 0.0
+
+
+@lru_cache(maxsize=4096)
+def _texto(s: str) -> float:
+    t = s.strip()
+    m = _RE_BR.fullmatch(t)
+    if m:
+        return float(f"{m.group(1).replace('.', '')}.{m.group(2)}")
+    if _RE_PONTO.fullmatch(t):
+        return float(t)
+    return _geral(s)
+
+
+def normalizar_preco(valor) -> float:
+    """
+    Converte o preço do ld+json em float. Aceita número (12.99),
+    texto com ponto decimal ("12.99") e formato brasileiro ("R$ 1.299,90").
+    Retorna 0.0 quando não dá para converter.
+    """
+    if valor is None:
+        return 0.0
+    if isinstance(valor, (int, float)):
+        v = float(valor)
+        return v if math.isfinite(v) else 0.0
+    return _texto(valor if isinstance(valor, str) else str(valor))
+
+
+def normalizar_coluna(valores, vazio: float = 0.0) -> pd.Series:
+    """
+    normalizar_preco aplicado a uma coluna inteira (Series, array ou lista) com
+    operações vetorizadas do pandas. Células vazias (None/NaN) viram `vazio`
+    (np.nan mantém o buraco: dia sem coleta numa planilha wide).
+    """
+    s = valores if isinstance(valores, pd.Series) else pd.Series(valores, dtype="object")
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return s.astype("float64").replace([np.inf, -np.inf], 0.0).fillna(vazio)
+
+    eh_texto = s.map(lambda v: isinstance(v, str)).astype(bool)
+    saida = pd.to_numeric(s.where(~eh_texto), errors="coerce").astype("float64")
+    saida = saida.replace([np.inf, -np.inf], 0.0)
+    if eh_texto.any():
+        t = (
+            s[eh_texto].str.strip()
+            .str.replace("R$", "", regex=False)
+            .str.replace("\u00a0", "", regex=False)
+            .str.replace(" ", "", regex=False)
+        )
+        virgula = t.str.contains(",", regex=False)
+        t = t.where(~virgula, t.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+        milhar = ~virgula & t.str.fullmatch(r"[^.]*\.[^.]{3}")
+        t = t.where(~milhar, t.str.replace(".", "", regex=False))
+        convertidos = pd.to_numeric(t, errors="coerce")
+        saida[eh_texto] = convertidos.where(np.isfinite(convertidos), 0.0)
+    return saida.fillna(vazio)
+
+
+def _colunas_preco(header) -> list:
+    return [i for i, h in enumerate(header) if isinstance(h, str) and (h == "Preço" or h.startswith("Preço_"))]
+
+
+def renormalizar_excel(caminho: str) -> int:
+    """
+    Renormaliza no lugar (openpyxl) as colunas "Preço"/"Preço_YYYYMMDD" de todas
+    as abas, uma coluna por vez; células vazias continuam vazias. Devolve
+    quantas células mudaram.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(caminho)
+    mudadas = 0
+    for ws in wb.worksheets:
+        if ws.max_row < 2:
+            continue
+        header = [c.value for c in ws[1]]
+        for col in _colunas_preco(header):
+            celulas = [linha[0] for linha in ws.iter_rows(min_row=2, min_col=col + 1, max_col=col + 1)]
+            antes = [c.value for c in celulas]
+            depois = normalizar_coluna(antes, vazio=np.nan)
+            for celula, v0, v in zip(celulas, antes, depois):
+                novo = None if np.isnan(v) else float(v)
+                if novo != v0:
+                    celula.value = novo
+                    mudadas += 1
+    if mudadas:
+        wb.save(caminho)
+    return mudadas
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("uso: python -m carrefour.precos <arquivo.xlsx> [...]")
+        sys.exit(2)
+    for arq in sys.argv[1:]:
+        print(f"🧮 {arq}: {renormalizar_excel(arq)} célula(s) renormalizada(s).")
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Bloqueio de recursos dispensáveis no Chrome (CDP Network.setBlockedURLs) e
+contagem de rede por página. O ld+json vem no HTML: fontes, mídia, analytics e
+tags de terceiros só atrasam a página e gastam banda. CSS e JS do próprio site
+continuam liberados (o fluxo de CEP depende de layout e scripts).
+
+    CARREFOUR_BLOQUEIO=0          desliga o bloqueio
+    CARREFOUR_BLOQUEIO_EXTRA      padrões extras, separados por vírgula
+    CARREFOUR_MEDIR_REDE=0        desliga a contagem (log de performance do Chrome)
+"""
+
+import json
+import os
+import threading
+
+BLOQUEIO = os.environ.get("CARREFOUR_BLOQUEIO", "1") not in ("0", "false", "no")
+MEDIR_REDE = os.environ.get("CARREFOUR_MEDIR_REDE", "1") not in ("0", "false", "no")
+
+# padrões no formato do Network.setBlockedURLs ('*' curinga)
+PADROES_BLOQUEADOS = [
+    # mídia e fontes
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*",
+    "*.mp4*", "*.webm*", "*.woff*", "*.woff2*", "*.ttf*", "*.otf*",
+    # analytics, tag managers, anúncios e monitoramento
+    "*googletagmanager.com*", "*google-analytics.com*", "*analytics.google.com*",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*",
+    "*facebook.net*", "*facebook.com/tr*", "*connect.facebook.net*",
+    "*hotjar.com*", "*clarity.ms*", "*bing.com*", "*tiktok.com*", "*criteo.*",
+    "*taboola.com*", "*outbrain.com*", "*nr-data.net*", "*newrelic.com*",
+    "*datadoghq*", "*sentry.io*", "*youtube.com*", "*ytimg.com*",
+]
+PADROES_BLOQUEADOS += [p.strip() for p in os.environ.get("CARREFOUR_BLOQUEIO_EXTRA", "").split(",") if p.strip()]
+
+
+def opcoes_chrome(opts):
+    """Liga o log de performance (rede) nas ChromeOptions, se a contagem estiver ativa."""
+    if MEDIR_REDE:
+        opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        opts.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def configurar_bloqueio(driver, padroes=None):
+    """Ativa o bloqueio de URLs via CDP no driver recém-criado."""
+    if not BLOQUEIO:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": padroes or PADROES_BLOQUEADOS})
+    except Exception as e:
+        print("⚠️ Bloqueio de recursos indisponível:", e)
+
+
+class ContadorRede:
+    """
+    Requisições feitas/bloqueadas e bytes transferidos por página carregada
+    (thread-safe). Uma medida por carga: a mesma URL em várias cidades ou
+    numa retentativa conta de novo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.medidas = []   # (url, feitas, bloqueadas, bytes)
+
+    def coletar(self, driver, url: str):
+        """Lê (e esvazia) o log de performance do driver e atribui à URL."""
+        if not MEDIR_REDE:
+            return
+        try:
+            entradas = driver.get_log("performance")
+        except Exception:
+            return
+        feitas = bloqueadas = 0
+        transferidos = 0
+        for entrada in entradas:
+            try:
+                msg = json.loads(entrada["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            metodo = msg.get("method")
+            if metodo == "Network.loadingFinished":
+                feitas += 1
+                transferidos += int(msg.get("params", {}).get("encodedDataLength") or 0)
+            elif metodo == "Network.loadingFailed":
+                if msg.get("params", {}).get("blockedReason"):
+                    bloqueadas += 1
+                else:
+                    feitas += 1
+        with self._lock:
+            self.medidas.append((url, feitas, bloqueadas, transferidos))
+
+    def descartar(self, driver):
+        """Esvazia o log sem contar: tráfego que não é de página (fixação do CEP)."""
+        if not MEDIR_REDE:
+            return
+        try:
+            driver.get_log("performance")
+        except Exception:
+            pass
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            medidas = [m[1:] for m in self.medidas]
+        return {
+            "paginas": len(medidas),
+            "requisicoes": sum(m[0] for m in medidas),
+            "bloqueadas": sum(m[1] for m in medidas),
+            "bytes": sum(m[2] for m in medidas),
+        }
+
+    def resumo(self) -> str:
+        with self._lock:
+            medidas = [m[1:] for m in self.medidas]
+        if not medidas:
+            return "📶 Sem medidas de rede."
+        feitas = sum(m[0] for m in medidas)
+        bloqueadas = sum(m[1] for m in medidas)
+        transferidos = sum(m[2] for m in medidas)
+        return (
+            f"📶 Rede em {len(medidas)} página(s): {feitas} requisições "
+            f"({transferidos / 1e6:.1f} MB, {transferidos / 1e3 / len(medidas):.0f} KB/página), "
+            f"{bloqueadas} bloqueadas ({bloqueadas / len(medidas):.0f}/página)"
+        )
+
+
+REDE = ContadorRede()
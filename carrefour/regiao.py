@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Contexto regional em cache por CEP.
+Depois de um fix_location bem-sucedido, salva os cookies, o localStorage e os
+seletores que funcionaram em .cache/regiao_<cep>.json. Nas próximas execuções
+o estado é injetado direto no navegador (sem passear pela UI); se o site
+rejeitar o estado, cai no fix_location com os seletores salvos na frente.
+Com o estado em cache, trocar de cidade num navegador já aberto é só limpar e
+injetar cookies (trocar_regiao): o runner usa poucos Chromes quentes para todas
+as cidades em vez de abrir um (com cache frio) por cidade.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import weakref
+
+from carrefour.browser import HOME, fix_location
+from carrefour.metricas import ETAPAS
+from carrefour.rede import REDE
+from carrefour.urls import CACHE_DIR, SUFIXO_CACHE
+from carrefour.wait import esperar_dom
+
+# estado mais velho que isso é ignorado (dias)
+VALIDADE_DIAS = float(os.environ.get("CARREFOUR_REGIAO_VALIDADE_DIAS", "7"))
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+# CEP atualmente fixado em cada driver aberto (trocar_regiao)
+_regiao_atual = weakref.WeakKeyDictionary()
+
+
+def _lock_cep(cep: str) -> threading.Lock:
+    with _locks_guard:
+        return _locks.setdefault(cep, threading.Lock())
+
+
+def _digitos(cep: str) -> str:
+    return re.sub(r"\D", "", cep)
+
+
+def _arquivo(cep: str) -> str:
+    return os.path.join(CACHE_DIR, f"regiao_{_digitos(cep)}{SUFIXO_CACHE}.json")
+
+
+def carregar_estado(cep: str):
+    """Estado salvo do CEP (dict) ou None se não existir/estiver vencido."""
+    try:
+        with open(_arquivo(cep), encoding="utf-8") as fh:
+            estado = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if time.time() - estado.get("salvo_em", 0) > VALIDADE_DIAS * 86400:
+        return None
+    return estado
+
+
+def salvar_estado(cep: str, driver, seletores: dict):
+    estado = {
+        "cep": cep,
+        "salvo_em": time.time(),
+        "seletores": seletores,
+        "cookies": driver.get_cookies(),
+        "local_storage": driver.execute_script(
+            "const o = {}; for (let i = 0; i < localStorage.length; i++) {"
+            " const k = localStorage.key(i); o[k] = localStorage.getItem(k); } return o;"
+        ) or {},
+    }
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = _arquivo(cep) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(estado, fh, ensure_ascii=False)
+    os.replace(tmp, _arquivo(cep))
+
+
+def injetar_estado(driver, estado: dict):
+    """Aplica cookies e localStorage salvos (precisa estar no domínio do site)."""
+    driver.get(HOME)
+    esperar_dom(driver)
+    for c in estado.get("cookies", []):
+        cookie = {k: v for k, v in c.items() if k in ("name", "value", "domain", "path", "secure", "httpOnly")}
+        if "expiry" in c:
+            cookie["expiry"] = int(c["expiry"])
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            # domínio com ponto inicial/subdomínio diferente: tenta sem domain
+            cookie.pop("domain", None)
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                pass
+    if estado.get("local_storage"):
+        driver.execute_script(
+            "const o = arguments[0]; for (const k in o) localStorage.setItem(k, o[k]);",
+            estado["local_storage"],
+        )
+    driver.get(HOME)
+    esperar_dom(driver)
+
+
+def regiao_valida(driver, estado: dict, cep: str) -> bool:
+    """
+    Heurística de aceitação do estado injetado: a maior parte dos cookies
+    continua lá depois do reload (o site não os descartou) e o CEP aparece na
+    página, nos cookies ou no localStorage.
+    """
+    atuais = {c["name"] for c in driver.get_cookies()}
+    salvos = {c["name"] for c in estado.get("cookies", [])}
+    if len(salvos - atuais) > len(salvos) // 2:
+        return False
+    digitos = _digitos(cep)
+    texto = driver.execute_script(
+        "return [document.body ? document.body.innerText : '',"
+        " document.cookie, JSON.stringify(Object.assign({}, localStorage))].join(' ');"
+    ) or ""
+    return re.search(rf"(?<!\d){digitos[:5]}-?{digitos[5:]}(?!\d)", texto) is not None
+
+
+@ETAPAS.cronometrar("fixar_regiao")
+def fixar_regiao(driver, cep: str):
+    """
+    Fixa o CEP usando o estado em cache quando possível; senão roda o
+    fix_location (sondagem rápida) e atualiza o cache.
+    Um lock por CEP faz os drivers do pool reaproveitarem o estado do primeiro.
+    As cargas da home feitas aqui saem do log de rede: não contam na próxima página.
+    """
+    try:
+        with _lock_cep(cep):
+            _fixar_regiao(driver, cep)
+    finally:
+        REDE.descartar(driver)
+
+
+def _fixar_regiao(driver, cep: str):
+    estado = carregar_estado(cep)
+    if estado and estado.get("cookies"):
+        try:
+            injetar_estado(driver, estado)
+            if regiao_valida(driver, estado, cep):
+                print(f"📍 CEP {cep}: estado regional reaproveitado do cache.")
+                return
+            print(f"⚠️ CEP {cep}: estado em cache rejeitado; refazendo pela UI.")
+        except Exception as e:
+            print(f"⚠️ CEP {cep}: falha ao injetar estado em cache:", e)
+
+    seletores = fix_location(driver, cep, preferidos=(estado or {}).get("seletores"))
+    if seletores.get("cep"):
+        salvar_estado(cep, driver, seletores)
+    else:
+        print(f"⚠️ CEP {cep}: campo de CEP não encontrado.")
+
+
+def limpar_regiao(driver):
+    """Apaga cookies e storage do site no driver (sem reabrir o navegador)."""
+    try:
+        driver.delete_all_cookies()
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+    except Exception as e:
+        print("⚠️ Falha ao limpar o contexto regional:", e)
+    _regiao_atual.pop(driver, None)
+
+
+def trocar_regiao(driver, cep):
+    """
+    Garante que o driver está no CEP pedido (None = sem região, SP).
+    Não faz nada se já estiver; senão limpa o contexto e fixa o novo CEP.
+    """
+    if driver in _regiao_atual and _regiao_atual[driver] == cep:
+        return
+    if driver in _regiao_atual:
+        limpar_regiao(driver)
+    if cep:
+        fixar_regiao(driver, cep)
+    _regiao_atual[driver] = cep
+
+
+@ETAPAS.cronometrar("capturar_cookies")
+def capturar_cookies_regioes(build_driver, ceps) -> dict:
+    """
+    Cookies regionais de vários CEPs com um único Chrome (o cache de JS/fontes
+    do site é aproveitado entre as cidades). {cep: cookies}; None se falhou.
+    CEP None (SP) não precisa de contexto: [].
+    """
+    ceps = list(dict.fromkeys(ceps))
+    saida = {cep: [] for cep in ceps if not cep}
+    regionais = [cep for cep in ceps if cep]
+    if not regionais:
+        return saida
+    try:
+        driver = build_driver()
+    except Exception as e:
+        print("❌ Falha ao abrir o driver para capturar cookies:", e)
+        return {**saida, **{cep: None for cep in regionais}}
+    try:
+        for cep in regionais:
+            try:
+                trocar_regiao(driver, cep)
+                saida[cep] = driver.get_cookies()
+            except Exception as e:
+                print(f"⚠️ CEP {cep}: falha ao capturar cookies regionais:", e)
+                saida[cep] = None
+                limpar_regiao(driver)
+    finally:
+        driver.quit()
+    return saida
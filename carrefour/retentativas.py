@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Segunda passada para as falhas: em vez de repetir a página na hora (segurando o
+worker), a URL que falhou vai para uma fila adiada e é tentada de novo no fim da
+execução, em rodadas com backoff exponencial com jitter. Cada classe de erro tem
+seu orçamento de novas tentativas por execução:
+
+    timeout      o Product não apareceu no prazo
+    sem_produto  a página carregou, mas sem Product/ItemList
+    parse        ld+json inválido/inesperado
+    excecao      erro do driver/rede
+
+    CARREFOUR_RETRY_ORCAMENTO="timeout=40,sem_produto=10,parse=5,excecao=20"
+    CARREFOUR_RETRY_RODADAS=2     CARREFOUR_RETRY_BASE_S=5
+"""
+
+import os
+import random
+import threading
+import time
+
+ORCAMENTO_PADRAO = {"timeout": 40, "sem_produto": 10, "parse": 5, "excecao": 20}
+RODADAS = int(os.environ.get("CARREFOUR_RETRY_RODADAS", "2"))
+BASE_S = float(os.environ.get("CARREFOUR_RETRY_BASE_S", "5"))
+TETO_S = 60.0
+
+_falhas = {}
+_lock = threading.Lock()
+
+
+def _orcamento_env() -> dict:
+    orcamento = dict(ORCAMENTO_PADRAO)
+    for parte in os.environ.get("CARREFOUR_RETRY_ORCAMENTO", "").split(","):
+        classe, _, n = parte.partition("=")
+        if classe.strip() and n.strip().isdigit():
+            orcamento[classe.strip()] = int(n)
+    return orcamento
+
+
+def anotar_falha(url: str, classe: str, cidade=None):
+    """
+    Chamado pelos scrapers: por que a URL falhou (última tentativa). A chave é
+    (cidade, URL): o runner coleta todas as cidades no mesmo processo.
+    """
+    with _lock:
+        _falhas[(cidade, url)] = classe
+
+
+def classe_falha(url: str, cidade=None) -> str:
+    with _lock:
+        return _falhas.get((cidade, url), "excecao")
+
+
+def falhou(resultado) -> bool:
+    # página de produto: registro sem preço; listagem: lista vazia
+    if isinstance(resultado, list):
+        return not resultado
+    return resultado is None or resultado.get("Preço", 0) <= 0
+
+
+def espera_backoff(rodada: int, base: float = BASE_S, teto: float = TETO_S) -> float:
+    """base * 2^(rodada-1), com jitter de ±50%, limitado ao teto."""
+    return min(teto, base * 2 ** (rodada - 1)) * random.uniform(0.5, 1.5)
+
+
+class Agendador:
+    """Fila adiada de falhas com orçamento por classe de erro (uma execução)."""
+
+    def __init__(self, orcamento: dict | None = None, rodadas: int = RODADAS, base: float = BASE_S):
+        self.restante = dict(orcamento or _orcamento_env())
+        self.rodadas = rodadas
+        self.base = base
+
+    def _escolher(self, falhas, chave) -> list:
+        escolhidos, sem_orcamento = [], 0
+        for item in falhas:
+            classe = classe_falha(*chave(item))
+            if self.restante.get(classe, 0) > 0:
+                self.restante[classe] -= 1
+                escolhidos.append(item)
+            else:
+                sem_orcamento += 1
+        if sem_orcamento:
+            print(f"🔁 {sem_orcamento} falha(s) sem orçamento de retentativa.")
+        return escolhidos
+
+    def segunda_passada(self, resultados: dict, refazer, chave=lambda item: (item, None)) -> dict:
+        """
+        resultados: {item: resultado}; refazer(itens) -> [resultado, ...] na mesma ordem;
+        chave(item) -> (url, cidade) com que a falha foi anotada.
+        Devolve `resultados` com as falhas recuperadas substituídas.
+        """
+        for rodada in range(1, self.rodadas + 1):
+            adiados = self._escolher([i for i, r in resultados.items() if falhou(r)], chave)
+            if not adiados:
+                break
+            espera = espera_backoff(rodada, self.base)
+            print(f"\n🔁 Rodada {rodada}: {len(adiados)} URL(s) adiadas; tentando de novo em {espera:.1f}s.")
+            time.sleep(espera)
+            recuperados = 0
+            for item, novo in zip(adiados, refazer(adiados)):
+                if not falhou(novo):
+                    resultados[item] = novo
+                    recuperados += 1
+            print(f"🔁 Rodada {rodada}: {recuperados}/{len(adiados)} recuperada(s).")
+        return resultados
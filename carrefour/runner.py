@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Runner asyncio: coleta todas as cidades num único processo / event loop.
+Os cookies regionais de todos os CEPs (carrefour/cidades.json) saem de um único
+Chrome; as URLs são buscadas por HTTP em paralelo, com limite de taxa por host
+compartilhado entre as cidades; o que não tiver Product cai num único pool de
+Chrome para todas as cidades, que troca de região por cookies injetados (os
+drivers seguem quentes: JS e fontes do site baixados uma vez, não seis). Uso:
+
+    python -m carrefour.runner            # todas as cidades
+    python -m carrefour.runner bh rj      # só algumas (pela chave)
+"""
+
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import partial
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from carrefour.browser import build_driver
+from carrefour.cache_http import CACHE_HTTP
+from carrefour.catalogo import lista_trabalho
+from carrefour.cidades import ALVOS, Alvo
+from carrefour.core import pasta_dados, recuperar_diarios, relatorio, salvar_cidade
+from carrefour.diario import Diario
+from carrefour.http_fetch import FETCH_MODE, build_session
+from carrefour.metricas import ETAPAS, salvar_relatorio
+from carrefour.pool import POOL_SIZE, coletar_em_pool
+from carrefour.rede import REDE
+from carrefour.regiao import capturar_cookies_regioes, trocar_regiao
+from carrefour.retentativas import Agendador
+from carrefour.saude import SaudeUrls
+from carrefour.scrape import registros_finais, scrape_via_http, scrape_via_json, vazio
+from carrefour.wait import TEMPOS
+
+# limites compartilhados por host (todas as cidades batem no mesmo domínio)
+RATE_POR_HOST = float(os.environ.get("CARREFOUR_RATE_POR_HOST", "8"))            # req/s
+CONCORRENCIA_POR_HOST = int(os.environ.get("CARREFOUR_CONCORRENCIA_POR_HOST", "8"))
+
+
+class LimitadorPorHost:
+    """
+    Limite por host: no máximo `rate` inícios de requisição por segundo
+    e `concorrencia` requisições em voo ao mesmo tempo.
+    """
+
+    def __init__(self, rate: float, concorrencia: int):
+        self.intervalo = 1.0 / rate if rate > 0 else 0.0
+        self.concorrencia = max(1, concorrencia)
+        self._sems = {}
+        self._locks = {}
+        self._proximo = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = urlsplit(url).netloc
+        sem = self._sems.setdefault(host, asyncio.Semaphore(self.concorrencia))
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with sem:
+            async with lock:
+                loop = asyncio.get_running_loop()
+                espera = self._proximo.get(host, 0.0) - loop.time()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+                self._proximo[host] = loop.time() + self.intervalo
+            yield
+
+
+class Tarefa(NamedTuple):
+    """Uma URL de uma cidade no pool de Chrome compartilhado."""
+    alvo: Alvo
+    url: str
+
+    def __str__(self):
+        return f"[{self.alvo.chave}] {self.url}"
+
+
+def _tag(alvo: Alvo):
+    return alvo.cidade if alvo.coluna_cidade else None
+
+
+def _chave_falha(tarefa: Tarefa):
+    # mesma chave com que scrape_via_json anota a falha: (url, cidade)
+    return tarefa.url, _tag(tarefa.alvo)
+
+
+def _scrape_regional(tarefa: Tarefa, driver, diarios: dict):
+    # o driver só troca de CEP quando a fila passa para a próxima cidade
+    trocar_regiao(driver, tarefa.alvo.cep)
+    resultado = scrape_via_json(tarefa.url, driver, _tag(tarefa.alvo))
+    diarios[tarefa.alvo.chave].anotar(tarefa.url, resultado)
+    return resultado
+
+
+async def _coletar_http(alvo: Alvo, urls, cookies, limitador: LimitadorPorHost, diario: Diario) -> dict:
+    """{url: registro(s)} das URLs lidas via HTTP (sem cookies: {})."""
+    if cookies is None or not urls:
+        return {}
+    session = build_session(cookies, pool_size=limitador.concorrencia, regiao=alvo.cep)
+    scrape = diario.anotando(scrape_via_http)
+    tag = _tag(alvo)
+
+    def _fresca(url) -> bool:
+        return CACHE_HTTP is not None and CACHE_HTTP.fresca(CACHE_HTTP.ler(url, session.regiao))
+
+    async def _um(url):
+        # entrada fresca no cache HTTP não vai à rede: não passa pelo limite por host
+        if await asyncio.to_thread(_fresca, url):
+            return await asyncio.to_thread(scrape, url, session, tag)
+        async with limitador.slot(url):
+            return await asyncio.to_thread(scrape, url, session, tag)
+
+    regs = await asyncio.gather(*map(_um, urls))
+    return {url: reg for url, reg in zip(urls, regs) if reg is not None}
+
+
+async def coletar_todas(alvos, urls=None) -> list:
+    """
+    Coleta todas as cidades; retorna as chaves que falharam.
+    1) cookies de todas as regiões num único Chrome (cache de JS/fontes quente)
+    2) HTTP de todas as cidades em paralelo, com limite por host
+    3) um único pool de Chrome para o que faltou em todas as cidades, na ordem
+       cidade a cidade: cada driver troca de região por cookies injetados, sem reabrir
+    4) segunda passada: falhas adiadas tentadas de novo no fim, com backoff
+    5) gravação por cidade
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(
+        max_workers=CONCORRENCIA_POR_HOST + 2 * len(alvos), thread_name_prefix="runner",
+    ))
+    limitador = LimitadorPorHost(RATE_POR_HOST, CONCORRENCIA_POR_HOST)
+    novo_driver = partial(build_driver, headless=True)
+    hoje = datetime.now()
+    inicio = time.monotonic()
+    # lista canônica (1 URL por SKU + listagens, carrefour/catalogo.py) se nenhuma for passada
+    urls = lista_trabalho() if urls is None else urls
+    unicas = list(dict.fromkeys(urls))
+    falhas = []
+    # diários de dias anteriores que sobraram de uma execução interrompida
+    for a in alvos:
+        try:
+            recuperar_diarios(a, hoje)
+        except Exception as e:
+            print(f"❌ [{a.chave}] Falhou ao recuperar diário antigo:", e)
+    # por cidade: URLs em backoff ficam de fora, retestes no fim (carrefour/saude.py)
+    saude = {a.chave: SaudeUrls(pasta_dados(a), a.cep, _tag(a)) for a in alvos}
+    fila = {a.chave: saude[a.chave].filtrar(unicas, hoje.date()) for a in alvos}
+    # diário por cidade: o que já saiu hoje (execução interrompida) não é refeito
+    diarios = {a.chave: Diario(pasta_dados(a), hoje.strftime("%Y-%m-%d")) for a in alvos}
+    feitos = {a.chave: diarios[a.chave].feitos() for a in alvos}
+    pendentes = {a.chave: [u for u in fila[a.chave] if u not in feitos[a.chave]] for a in alvos}
+
+    t0 = time.monotonic()
+    cookies = {}
+    if FETCH_MODE == "http":
+        cookies = await asyncio.to_thread(
+            capturar_cookies_regioes, novo_driver, [a.cep for a in alvos if pendentes[a.chave]]
+        )
+    resultados = await asyncio.gather(
+        *(_coletar_http(a, pendentes[a.chave], cookies.get(a.cep), limitador, diarios[a.chave]) for a in alvos),
+        return_exceptions=True,
+    )
+    por_alvo = {}
+    for alvo, r in zip(alvos, resultados):
+        if isinstance(r, Exception):
+            print(f"❌ [{alvo.chave}] Falhou:", r)
+            falhas.append(alvo.chave)
+        else:
+            por_alvo[alvo.chave] = {**feitos[alvo.chave], **r}
+    print(f"🌐 HTTP: {sum(len(v) - len(feitos[k]) for k, v in por_alvo.items())} registro(s) "
+          f"em {time.monotonic() - t0:.0f}s")
+
+    t0 = time.monotonic()
+    tarefas = [
+        Tarefa(a, u) for a in alvos if a.chave in por_alvo for u in fila[a.chave] if u not in por_alvo[a.chave]
+    ]
+    if tarefas:
+        print(f"\n🧭 {len(tarefas)} URL(s) sem Product via HTTP — usando {POOL_SIZE} Chrome(s) para todas as cidades.")
+        chrome = partial(
+            coletar_em_pool,
+            build_driver=novo_driver,
+            scrape=partial(_scrape_regional, diarios=diarios),
+            workers=POOL_SIZE,
+            registro_vazio=lambda t: vazio(t.url, _tag(t.alvo)),
+            chave_falha=_chave_falha,
+        )
+        regs = await asyncio.to_thread(chrome, tarefas)
+        # falhas de todas as cidades numa fila adiada, orçamento único por classe de erro
+        por_tarefa = await asyncio.to_thread(
+            Agendador().segunda_passada, dict(zip(tarefas, regs)), chrome, _chave_falha,
+        )
+        for t, reg in por_tarefa.items():
+            por_alvo[t.alvo.chave][t.url] = reg
+        print(f"🌍 Chrome: {len(tarefas)} URL(s) em {time.monotonic() - t0:.0f}s")
+    print(TEMPOS.resumo())
+    print(REDE.resumo())
+
+    gravar = [a for a in alvos if a.chave in por_alvo]
+    registros = {}
+    for a in gravar:
+        saude[a.chave].registrar(
+            {u: por_alvo[a.chave][u] for u in pendentes[a.chave]}, hoje.strftime("%Y-%m-%d")
+        )
+        saude[a.chave].salvar()
+        registros[a.chave] = registros_finais(fila[a.chave], por_alvo[a.chave])
+    resultados = await asyncio.gather(
+        *(asyncio.to_thread(salvar_cidade, a, registros[a.chave], hoje) for a in gravar),
+        return_exceptions=True,
+    )
+    if CACHE_HTTP is not None:
+        CACHE_HTTP.podar()
+    print(ETAPAS.resumo())
+    for alvo, r in zip(gravar, resultados):
+        if isinstance(r, Exception):
+            print(f"❌ [{alvo.chave}] Falhou ao gravar:", r)
+            falhas.append(alvo.chave)
+            continue
+        diarios[alvo.chave].compactar()
+        # etapas, prontidão e rede são da execução inteira (recursos compartilhados)
+        salvar_relatorio(pasta_dados(alvo), hoje.strftime("%Y-%m-%d"),
+                         relatorio(alvo, registros[alvo.chave], hoje, inicio))
+    return falhas
+
+
+def main(argv=None) -> int:
+    chaves = sys.argv[1:] if argv is None else argv
+    desconhecidas = set(chaves) - {a.chave for a in ALVOS}
+    if desconhecidas:
+        print("❌ Cidade(s) desconhecida(s):", ", ".join(sorted(desconhecidas)))
+        return 2
+    alvos = [a for a in ALVOS if not chaves or a.chave in chaves]
+    t0 = time.monotonic()
+    falhas = asyncio.run(coletar_todas(alvos))
+    print(f"\n⏱️ {len(alvos)} cidade(s) em {time.monotonic() - t0:.0f}s")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
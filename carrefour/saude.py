@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de saúde das URLs, por cidade: falhas seguidas, último sucesso,
+última tentativa e último status HTTP, em <data_dir>/parquet/saude_urls.json
+(commitado junto com o Parquet). Na primeira vez é montado do histórico:
+partições de preços/erros do Parquet; sem Parquet (instalação só com Excel,
+antes do backfill), abas Historico dos Excel mensais + Excel de erros. Sem
+aba Historico (SP) não dá para ver os sucessos por URL: começa vazio. Das
+falhas do Excel só contam as de dias presentes no Historico (as abas antigas
+só guardavam a última rodada); um evento por (dia, URL).
+
+Só conta como falha a página que foi baixada e não tinha produto
+(sem_produto, HTTP 404/410). Timeout, exceção e registro vazio porque nenhum
+driver subiu são problema da infraestrutura, não da URL: não mexem no estado.
+
+URL com CARREFOUR_SAUDE_LIMIAR (3) falhas seguidas entra em backoff
+exponencial: só é testada de novo depois de 2, 4, 8, ... dias (até
+CARREFOUR_SAUDE_MAX_DIAS) — com uma execução por dia, a primeira espera já
+pula pelo menos um dia; as que estão para reteste vão para o fim da fila.
+CARREFOUR_SAUDE=0 desliga o filtro.
+"""
+
+import glob
+import json
+import os
+from datetime import date
+
+import pandas as pd
+
+from carrefour.http_fetch import STATUS
+from carrefour.parquet_store import ler
+from carrefour.retentativas import classe_falha, falhou
+from carrefour.urls import eh_produto
+
+ATIVO = os.environ.get("CARREFOUR_SAUDE", "1") not in ("0", "false", "no")
+LIMIAR = int(os.environ.get("CARREFOUR_SAUDE_LIMIAR", "3"))
+MAX_DIAS = int(os.environ.get("CARREFOUR_SAUDE_MAX_DIAS", "16"))
+# status HTTP de página que não existe mais
+STATUS_MORTA = (404, 410)
+
+
+class SaudeUrls:
+    """Estado de saúde por URL de uma cidade (uma pasta de dados)."""
+
+    def __init__(self, data_dir: str, regiao=None, cidade=None):
+        self.arquivo = os.path.join(data_dir, "parquet", "saude_urls.json")
+        self.data_dir = data_dir
+        self.regiao = regiao    # CEP da cidade: chave do STATUS junto com a URL
+        self.cidade = cidade    # tag da cidade: chave da classe de falha (carrefour/retentativas.py)
+        try:
+            with open(self.arquivo, encoding="utf-8") as fh:
+                self.urls = json.load(fh)
+        except (OSError, ValueError):
+            self.urls = self._do_historico()
+
+    def _eventos_excel(self) -> list:
+        """
+        (data, url, ok) das abas Historico (sucessos) e dos Excel de erros do mês.
+        Falhas de dias sem Historico ficam de fora: sem os sucessos do dia, uma
+        URL que voltou pareceria morta.
+        """
+        sucessos, falhas = [], []
+        for tabela, padrao, aba in (
+            (sucessos, "precos_carrefour_*.xlsx", "Historico"),
+            (falhas, "erros_carrefour_*.xlsx", 0),
+        ):
+            for arq in sorted(glob.glob(os.path.join(self.data_dir, padrao))):
+                try:
+                    df = pd.read_excel(arq, sheet_name=aba, usecols=["URL", "Data"])
+                except Exception:
+                    continue
+                tabela += [(str(d)[:10], u, aba != 0) for d, u in zip(df["Data"], df["URL"]) if isinstance(u, str)]
+        dias = {d for d, _, _ in sucessos}
+        return sucessos + [e for e in falhas if e[0] in dias]
+
+    def _do_historico(self) -> dict:
+        """Reconstrói falhas seguidas/último sucesso do Parquet (ou, sem Parquet, dos Excel)."""
+        eventos = []
+        for tabela, ok in (("precos", True), ("erros", False)):
+            df = ler(self.data_dir, tabela)
+            eventos += [(d, u, ok) for d, u in zip(df["data"], df["url"])]
+        if not eventos:
+            eventos = self._eventos_excel()
+        # listagens antigas caíam em erros (antes do leitor de ItemList): não contam
+        # um evento por (dia, URL): linhas repetidas do mesmo dia não são falhas seguidas
+        por_dia = {}
+        for data_str, url, ok in eventos:
+            if eh_produto(url):
+                por_dia[(data_str, url)] = por_dia.get((data_str, url), False) or ok
+        urls = {}
+        for (data_str, url), ok in sorted(por_dia.items()):
+            self._anotar(urls.setdefault(url, {}), data_str, ok)
+        return urls
+
+    @staticmethod
+    def _anotar(estado: dict, data_str: str, ok: bool, status=None):
+        estado["ultima_tentativa"] = data_str
+        if ok:
+            estado["falhas_seguidas"] = 0
+            estado["ultimo_sucesso"] = data_str
+        else:
+            estado["falhas_seguidas"] = estado.get("falhas_seguidas", 0) + 1
+        if status is not None:
+            estado["status"] = status
+
+    def espera_dias(self, url: str) -> int:
+        """Dias de espera entre tentativas (0 = testar sempre)."""
+        falhas = self.urls.get(url, {}).get("falhas_seguidas", 0)
+        if falhas < LIMIAR:
+            return 0
+        return min(2 ** (falhas - LIMIAR + 1), MAX_DIAS)
+
+    def filtrar(self, urls, hoje: date) -> list:
+        """URLs saudáveis primeiro, retestes vencidos no fim; as em backoff ficam de fora."""
+        if not ATIVO:
+            return list(urls)
+        saudaveis, retestes, pulados = [], [], 0
+        for url in urls:
+            espera = self.espera_dias(url)
+            if not espera:
+                saudaveis.append(url)
+                continue
+            ultima = date.fromisoformat(self.urls[url]["ultima_tentativa"])
+            if (hoje - ultima).days >= espera:
+                retestes.append(url)
+            else:
+                pulados += 1
+        if pulados or retestes:
+            print(f"🩺 {pulados} URL(s) em backoff puladas; {len(retestes)} reteste(s) no fim da fila.")
+        return saudaveis + retestes
+
+    def _pagina_morta(self, url: str, status) -> bool:
+        return status in STATUS_MORTA or classe_falha(url, self.cidade) == "sem_produto"
+
+    def registrar(self, por_url: dict, data_str: str):
+        """Anota o dia; falhas de infraestrutura (timeout, exceção, sem driver) são ignoradas."""
+        for url, resultado in por_url.items():
+            status = STATUS.get((self.regiao, url))
+            ok = not falhou(resultado)
+            if ok or self._pagina_morta(url, status):
+                self._anotar(self.urls.setdefault(url, {}), data_str, ok, status)
+
+    def salvar(self):
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        tmp = self.arquivo + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.urls, fh, ensure_ascii=False, sort_keys=True, indent=0)
+        os.replace(tmp, self.arquivo)
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Scraper: lê JSON-LD do tipo Product (via Chrome ou via HTTP) e, nas páginas
+de busca (/busca/), o ItemList — um registro por produto listado.
+`cidade` vai na coluna "Cidade" do registro; None omite a coluna (SP).
+"ID do Produto" é o SKU da URL (chave de todos os merges).
+"""
+
+from urllib.parse import urljoin
+
+from carrefour.http_fetch import fetch_ldjson
+from carrefour.ldjson import coerce_price, listing_from_blocks, product_from_blocks
+from carrefour.retentativas import anotar_falha
+from carrefour.urls import chave_produto, eh_produto
+from carrefour.wait import abrir_e_esperar
+
+
+def registro_vazio(url: str, cidade=None) -> dict:
+    reg = {"ID do Produto": chave_produto(url), "Nome do Produto": "Não encontrado", "Preço": 0.0, "URL": url}
+    return {"Cidade": cidade, **reg} if cidade else reg
+
+
+def _registro(name, price_float, url: str, cidade=None) -> dict:
+    print("✅", name, "| R$", price_float)
+    reg = {"ID do Produto": chave_produto(url), "Nome do Produto": name, "Preço": price_float, "URL": url}
+    return {"Cidade": cidade, **reg} if cidade else reg
+
+
+def scrape_product_via_json(url: str, driver, cidade=None) -> dict:
+    print(f"\n🔗 {url}")
+    # uma única chamada ao driver: espera o Product (sem sleep fixo) e já traz o ld+json
+    dados = abrir_e_esperar(driver, url)
+    if not dados.get("pronto"):
+        print("⌛ Product não apareceu no prazo; lendo o que houver.")
+
+    try:
+        if "produto" in dados:
+            p = dados["produto"]
+            found = (p.get("name", "Não encontrado"), coerce_price(p.get("price"))) if p else None
+        else:
+            found = product_from_blocks(dados.get("blocos") or [])
+        if found is not None:
+            return _registro(*found, url, cidade)
+    except Exception as e:
+        print("❌ Erro no parsing JSON-LD:", e)
+        anotar_falha(url, "parse", cidade)
+        return registro_vazio(url, cidade)
+
+    print("⚠️ Nada encontrado nessa URL.")
+    anotar_falha(url, "sem_produto" if dados.get("pronto") else "timeout" if dados else "excecao", cidade)
+    return registro_vazio(url, cidade)
+
+
+def scrape_product_via_http(url: str, session, cidade=None):
+    """Mesma leitura sem navegador; None quando não há Product (vai para o Chrome)."""
+    print(f"\n🌐 {url}")
+    try:
+        found = product_from_blocks(fetch_ldjson(session, url))
+    except Exception as e:
+        print("❌ Erro HTTP:", e)
+        return None
+    return _registro(*found, url, cidade) if found is not None else None
+
+
+def _registros_listagem(url: str, itens, cidade=None) -> list:
+    regs = [
+        _registro(nome, preco, urljoin(url, url_item), cidade)
+        for nome, preco, url_item in itens
+        if preco > 0
+    ]
+    print(f"📋 {len(regs)} produto(s) com preço na listagem.")
+    return regs
+
+
+def scrape_listing_via_http(url: str, session, cidade=None):
+    """Registros dos produtos de uma página de busca; None se não houver ItemList (vai para o Chrome)."""
+    print(f"\n🌐📋 {url}")
+    try:
+        itens = listing_from_blocks(fetch_ldjson(session, url, ate_produto=False))
+    except Exception as e:
+        print("❌ Erro HTTP:", e)
+        return None
+    return _registros_listagem(url, itens, cidade) if itens else None
+
+
+def scrape_listing_via_json(url: str, driver, cidade=None) -> list:
+    """Mesma leitura no Chrome (listagens renderizadas no cliente); [] se nada."""
+    print(f"\n📋 {url}")
+    dados = abrir_e_esperar(driver, url, modo="blocos")
+    try:
+        regs = _registros_listagem(url, listing_from_blocks(dados.get("blocos") or []), cidade)
+    except Exception as e:
+        print("❌ Erro no parsing do ItemList:", e)
+        anotar_falha(url, "parse", cidade)
+        return []
+    if not regs:
+        anotar_falha(url, "sem_produto" if dados.get("pronto") else "timeout" if dados else "excecao", cidade)
+    return regs
+
+
+def mesclar_listagens(registros, extras) -> list:
+    """
+    Acrescenta os produtos vindos das listagens aos registros das páginas de
+    produto (chave = ID do Produto). A página do produto tem prioridade; um
+    produto que falhou na própria página recebe o preço da listagem.
+    """
+    saida = list(registros)
+    pos = {r["ID do Produto"]: i for i, r in enumerate(saida)}
+    for reg in extras:
+        i = pos.get(reg["ID do Produto"])
+        if i is None:
+            pos[reg["ID do Produto"]] = len(saida)
+            saida.append(reg)
+        elif saida[i]["Preço"] <= 0:
+            saida[i] = reg
+    return saida
+
+
+# despacho por tipo de página: produto (1 registro) ou listagem (lista de registros)
+def scrape_via_http(url: str, session, cidade=None):
+    scrape = scrape_product_via_http if eh_produto(url) else scrape_listing_via_http
+    return scrape(url, session, cidade)
+
+
+def scrape_via_json(url: str, driver, cidade=None):
+    scrape = scrape_product_via_json if eh_produto(url) else scrape_listing_via_json
+    return scrape(url, driver, cidade)
+
+
+def vazio(url: str, cidade=None):
+    return registro_vazio(url, cidade) if eh_produto(url) else []
+
+
+def registros_finais(urls, por_url: dict) -> list:
+    """Registros das páginas de produto (na ordem de `urls`) + produtos das listagens."""
+    produtos = [por_url[u] for u in urls if eh_produto(u)]
+    extras = [r for u in urls if not eh_produto(u) for r in por_url[u]]
+    return mesclar_listagens(produtos, extras)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Armazenamento: 1 Excel por mês (aba "Precos" com coluna por dia)
++ Excel de erros/zeros do mês. Escrita incremental com openpyxl.
+"""
+
+import os
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+from carrefour.metricas import ETAPAS
+from carrefour.urls import chave_produto
+
+
+def arquivos_mensais(data_dir: str, sufixo: str, stamp_month: str):
+    """
+    Caminhos (precos, erros) do mês. SP usa sufixo vazio:
+    precos_carrefour_YYYY-MM.xlsx; as demais precos_carrefour_<sufixo>-YYYY-MM.xlsx
+    """
+    tag = f"{sufixo}-{stamp_month}" if sufixo else stamp_month
+    return (
+        os.path.join(data_dir, f"precos_carrefour_{tag}.xlsx"),
+        os.path.join(data_dir, f"erros_carrefour_{tag}.xlsx"),
+    )
+
+
+def _cabecalho(ws) -> list:
+    return [c.value for c in next(ws.iter_rows(min_row=1, max_row=1))] if ws.max_row >= 1 else []
+
+
+def _coluna(ws, header: list, nome: str) -> int:
+    """Índice (1-based) da coluna `nome`; cria no fim do cabeçalho se não existir."""
+    if nome in header:
+        return header.index(nome) + 1
+    header.append(nome)
+    ws.cell(row=1, column=len(header), value=nome)
+    return len(header)
+
+
+def _anexar_linhas(ws, df: pd.DataFrame):
+    """Acrescenta as linhas de df no fim da aba, casando as colunas pelo cabeçalho."""
+    header = [h for h in _cabecalho(ws) if h is not None]
+    if not header:
+        ws.delete_rows(1, ws.max_row)
+    cols = [_coluna(ws, header, c) for c in df.columns]
+    for valores in df.itertuples(index=False, name=None):
+        linha = [None] * len(header)
+        for col, v in zip(cols, valores):
+            linha[col - 1] = None if pd.isna(v) else v
+        ws.append(linha)
+
+
+def _remover_dia(ws, data_str: str):
+    """Tira do fim da aba o lote já gravado hoje (rodada repetida no mesmo dia)."""
+    header = _cabecalho(ws)
+    if "Data" not in header:
+        return
+    col = header.index("Data") + 1
+    r = ws.max_row
+    while r > 1 and ws.cell(row=r, column=col).value == data_str:
+        r -= 1
+    if r < ws.max_row:
+        ws.delete_rows(r + 1, ws.max_row - r)
+
+
+def _escrever_coluna_dia(ws, df_wide: pd.DataFrame, coluna_dia: str):
+    """
+    Escreve só a coluna do dia: mapeia as linhas existentes pela chave
+    ("ID do Produto", o SKU da URL) num dict, acrescenta produtos novos no fim
+    e não toca no resto. Planilhas antigas (chave = nome) ganham a coluna de ID:
+    pela URL da linha quando existe; senão pelo nome, só quando o nome leva a
+    um único produto hoje e esse ID ainda não está em outra linha.
+    """
+    header = _cabecalho(ws)
+    if not any(h is not None for h in header):
+        header = []
+        ws.delete_rows(1, ws.max_row)
+    if header and "ID do Produto" not in header:
+        ws.insert_cols(1)
+        ws.cell(row=1, column=1, value="ID do Produto")
+        header = ["ID do Produto"] + header
+    col_chave = _coluna(ws, header, "ID do Produto")
+    col_nome = _coluna(ws, header, "Nome do Produto")
+    col_dia = _coluna(ws, header, coluna_dia)
+    col_url = header.index("URL") + 1 if "URL" in header else None
+
+    ids_por_nome = {}
+    for chave, nome in zip(df_wide["ID do Produto"], df_wide["Nome do Produto"]):
+        ids_por_nome.setdefault(nome, set()).add(chave)
+
+    linhas = {}
+    sem_id = []
+    for r, valores in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
+        chave = valores[col_chave - 1]
+        if chave is None and col_url is not None and valores[col_url - 1]:
+            chave = chave_produto(valores[col_url - 1])
+            ws.cell(row=r, column=col_chave, value=chave)
+        if chave is not None:
+            linhas.setdefault(str(chave), r)
+        else:
+            sem_id.append((r, valores[col_nome - 1]))
+        # rodada repetida no mesmo dia substitui a coluna do dia
+        ws.cell(row=r, column=col_dia).value = None
+
+    for r, nome in sem_id:
+        ids = ids_por_nome.get(nome, set())
+        if len(ids) == 1:
+            chave = next(iter(ids))
+            if chave not in linhas:
+                ws.cell(row=r, column=col_chave, value=chave)
+                linhas[chave] = r
+
+    for chave, nome, preco in zip(df_wide["ID do Produto"], df_wide["Nome do Produto"], df_wide[coluna_dia]):
+        r = linhas.get(chave)
+        if r is None:
+            r = ws.max_row + 1
+            ws.cell(row=r, column=col_chave, value=chave)
+            linhas[chave] = r
+        # o nome mais recente fica na planilha (produto renomeado não vira linha nova)
+        ws.cell(row=r, column=col_nome, value=nome)
+        ws.cell(row=r, column=col_dia, value=float(preco))
+
+
+@ETAPAS.cronometrar("excel")
+def salvar_mensal(registros, arq_mensal: str, arq_erros: str, coluna_dia: str,
+                  data_str: str, historico: bool = True):
+    """
+    Atualiza o Excel do mês no lugar (openpyxl), sem read_excel/merge/reescrita
+    via pandas: só a coluna do dia é escrita e produtos novos viram linhas novas.
+    """
+    df_total = pd.DataFrame(registros)
+    if "ID do Produto" not in df_total.columns:
+        df_total.insert(0, "ID do Produto", df_total["URL"].map(chave_produto))
+    colunas = [c for c in ["Cidade", "ID do Produto", "Nome do Produto", "Preço", "URL"] if c in df_total.columns]
+    df_ok  = df_total[df_total["Preço"] > 0][colunas].copy()
+    df_err = df_total[df_total["Preço"] <= 0].copy()
+
+    # ---- Excel mensal: aba "Precos" com coluna diária ----
+    if not df_ok.empty:
+        # base "wide": 1 linha por produto, colunas por dia
+        df_wide = (
+            df_ok[["ID do Produto", "Nome do Produto", "Preço"]]
+            .drop_duplicates("ID do Produto", keep="last")
+            .rename(columns={"Preço": coluna_dia})
+        )
+
+        wb = load_workbook(arq_mensal) if os.path.exists(arq_mensal) else Workbook()
+        if "Precos" in wb.sheetnames:
+            ws = wb["Precos"]
+        elif len(wb.sheetnames) == 1 and wb.active.max_row == 1 and wb.active["A1"].value is None:
+            ws = wb.active
+            ws.title = "Precos"
+        else:
+            ws = wb.create_sheet("Precos", 0)
+        _escrever_coluna_dia(ws, df_wide, coluna_dia)
+
+        # opcional: histórico "longo" acumulado do mês em outra aba (só-acréscimo)
+        if historico:
+            ws_hist = wb["Historico"] if "Historico" in wb.sheetnames else wb.create_sheet("Historico")
+            _remover_dia(ws_hist, data_str)
+            df_ok_hist = df_ok.copy()
+            df_ok_hist["Data"] = data_str
+            _anexar_linhas(ws_hist, df_ok_hist)
+
+        wb.save(arq_mensal)
+        print(f"📁 Atualizado: {arq_mensal} (coluna {coluna_dia})")
+    else:
+        print("⚠️ Nenhum preço válido hoje.")
+
+    # ---- Log de erros do mês (opcional) ----
+    # rodada repetida no mesmo dia substitui o lote de erros do dia (como no Historico)
+    if not df_err.empty or os.path.exists(arq_erros):
+        if os.path.exists(arq_erros):
+            wb = load_workbook(arq_erros)
+            ws = wb.active
+            _remover_dia(ws, data_str)
+        else:
+            wb = Workbook()
+            ws = wb.active
+        if not df_err.empty:
+            df_err["Data"] = data_str
+            _anexar_linhas(ws, df_err)
+        wb.save(arq_erros)
+    if not df_err.empty:
+        print(f"⚠️ Erros/zeros salvos: {arq_erros}")
+    else:
+        print("✅ Sem erros hoje.")
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Saúde dos drivers do pool. Chrome headless de vida longa vaza memória e fica
+lento; travado, cada URL custa o page_load_timeout inteiro. Cada worker do pool
+tem um SupervisorDriver que acompanha, por driver:
+
+    - RSS do chromedriver + Chrome (soma da árvore de processos em /proc; Linux)
+    - tendência da latência: p50 das últimas páginas vs. p50 das primeiras
+    - timeouts/erros consecutivos
+
+e recicla o driver (quit + build_driver + fixação de CEP pelo estado em cache)
+quando algum limite é cruzado:
+
+    CARREFOUR_DRIVER_RSS_MB=1500      CARREFOUR_DRIVER_LENTIDAO=2.5
+    CARREFOUR_DRIVER_TIMEOUTS=3       CARREFOUR_DRIVER_MAX_PAGINAS=0  (0 = sem limite)
+"""
+
+import os
+import threading
+from collections import Counter, deque
+
+from carrefour.metricas import ETAPAS
+
+LIMITE_RSS_MB = float(os.environ.get("CARREFOUR_DRIVER_RSS_MB", "1500"))
+LIMITE_LENTIDAO = float(os.environ.get("CARREFOUR_DRIVER_LENTIDAO", "2.5"))
+LIMITE_TIMEOUTS = int(os.environ.get("CARREFOUR_DRIVER_TIMEOUTS", "3"))
+MAX_PAGINAS = int(os.environ.get("CARREFOUR_DRIVER_MAX_PAGINAS", "0"))
+# páginas na janela de latência (base e recente) e intervalo entre leituras de RSS
+JANELA = 8
+A_CADA_RSS = 5
+
+
+def _filhos(pid: int) -> list:
+    filhos = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as fh:
+                filhos += [int(p) for p in fh.read().split()]
+    except OSError:
+        pass
+    return filhos
+
+
+def descendentes(pid: int) -> list:
+    """PIDs de todos os descendentes de `pid` (via /proc; [] fora do Linux)."""
+    saida, pendentes, vistos = [], _filhos(pid), {pid}
+    while pendentes:
+        p = pendentes.pop()
+        if p in vistos:
+            continue
+        vistos.add(p)
+        saida.append(p)
+        pendentes += _filhos(p)
+    return saida
+
+
+def rss_kb(pid: int) -> int:
+    """RSS atual do processo (KB); 0 se não der para ler."""
+    try:
+        with open(f"/proc/{pid}/status") as fh:
+            for linha in fh:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def rss_mb(driver):
+    """RSS (MB) do chromedriver e de todos os processos filhos; None fora do Linux."""
+    try:
+        pid = driver.service.process.pid
+    except Exception:
+        return None
+    if not os.path.isdir(f"/proc/{pid}"):
+        return None
+    return sum(rss_kb(p) for p in [pid, *descendentes(pid)]) / 1024
+
+
+def _mediana(valores) -> float:
+    v = sorted(valores)
+    return v[len(v) // 2]
+
+
+class Reciclagens:
+    """Contagem (thread-safe) dos drivers reciclados, por motivo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.motivos = Counter()
+
+    def registrar(self, motivo: str):
+        with self._lock:
+            self.motivos[motivo] += 1
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return dict(self.motivos)
+
+
+RECICLAGENS = Reciclagens()
+
+
+class SupervisorDriver:
+    """
+    Driver de um worker + sinais de saúde. `preparar(driver)` (opcional) roda em
+    cada driver novo, p.ex. a fixação do CEP.
+    """
+
+    def __init__(self, build_driver, preparar=None, nome: str = "pool"):
+        self.build_driver = build_driver
+        self.preparar = preparar
+        self.nome = nome
+        self.driver = None
+        self.novo()
+
+    def novo(self):
+        self.driver = self.build_driver()
+        self.paginas = 0
+        self.consecutivos = 0
+        self.base = []
+        self.recentes = deque(maxlen=JANELA)
+        if self.preparar is not None:
+            try:
+                self.preparar(self.driver)
+            except Exception as e:
+                print(f"⚠️ [{self.nome}] Falha ao preparar o driver:", e)
+        return self.driver
+
+    def registrar(self, segundos: float, falhou: bool):
+        """Uma página processada: duração total e se terminou em timeout/erro."""
+        self.paginas += 1
+        self.consecutivos = self.consecutivos + 1 if falhou else 0
+        if len(self.base) < JANELA:
+            self.base.append(segundos)
+        else:
+            self.recentes.append(segundos)
+
+    def motivo_reciclar(self):
+        """Motivo para reciclar o driver agora (str) ou None se está saudável."""
+        if self.consecutivos >= LIMITE_TIMEOUTS:
+            return "timeouts"
+        if MAX_PAGINAS and self.paginas >= MAX_PAGINAS:
+            return "paginas"
+        if len(self.recentes) == JANELA and _mediana(self.recentes) > LIMITE_LENTIDAO * max(_mediana(self.base), 0.1):
+            return "lentidao"
+        if self.paginas % A_CADA_RSS == 0:
+            rss = rss_mb(self.driver)
+            if rss is not None and rss > LIMITE_RSS_MB:
+                return "memoria"
+        return None
+
+    def reciclar(self, motivo: str):
+        print(f"♻️ [{self.nome}] Reciclando o driver após {self.paginas} página(s): {motivo}.")
+        RECICLAGENS.registrar(motivo)
+        self.fechar()
+        with ETAPAS.medir("reciclar_driver"):
+            return self.novo()
+
+    def verificar(self):
+        """Recicla se preciso; devolve o driver em uso."""
+        motivo = self.motivo_reciclar()
+        return self.reciclar(motivo) if motivo else self.driver
+
+    def fechar(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                print(f"⚠️ [{self.nome}] Falha ao fechar o driver:", e)
+            self.driver = None
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Espera orientada a prontidão (no lugar dos time.sleep fixos).
+Um MutationObserver injetado devolve assim que existe um
+<script type="application/ld+json"> com "Product" no DOM, ou no prazo,
+e na mesma chamada já traz o conteúdo ld+json (sem find_elements/get_attribute).
+O tempo até ficar pronto é registrado por página carregada (TEMPOS).
+"""
+
+import os
+import threading
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from carrefour.metricas import ETAPAS, percentis
+from carrefour.rede import REDE
+
+# prazo máximo (s) esperando o Product aparecer depois do driver.get
+ESPERA_PRODUTO = float(os.environ.get("CARREFOUR_ESPERA_PRODUTO", "8"))
+
+# o que o script injetado devolve numa única chamada ao chromedriver:
+# "blocos" = todos os textos ld+json; "produto" = {name, price} já lido no navegador
+EXTRACAO = os.environ.get("CARREFOUR_EXTRACAO", "blocos").lower()
+
+# arguments[0] = prazo em ms; arguments[1] = modo; o último é o callback
+JS_ESPERA_PRODUTO = """
+const prazo = arguments[0];
+const modo = arguments[1];
+const done = arguments[arguments.length - 1];
+const blocos = () => Array.from(
+  document.querySelectorAll('script[type="application/ld+json"]'),
+  s => s.textContent || ''
+);
+const produto = (raws) => {
+  for (const raw of raws) {
+    let data;
+    try { data = JSON.parse(raw); } catch (e) { continue; }
+    const objs = Array.isArray(data) ? data
+      : (data && Array.isArray(data['@graph'])) ? data['@graph'] : [data];
+    for (const o of objs) {
+      if (!o || o['@type'] !== 'Product') continue;
+      let offers = o.offers || {};
+      if (Array.isArray(offers)) offers = offers[0] || {};
+      // mesma ordem do _preco_offers (carrefour/ldjson.py): price, priceSpecification, lowPrice
+      const price = offers.price || (offers.priceSpecification || {}).price || offers.lowPrice || null;
+      return {name: o.name || 'Não encontrado', price: price};
+    }
+  }
+  return null;
+};
+const responder = (pronto) => {
+  const raws = blocos();
+  done(modo === 'produto' ? {pronto, produto: produto(raws)} : {pronto, blocos: raws});
+};
+const temProduto = () => blocos().some(t => t.indexOf('"Product"') !== -1);
+if (temProduto()) { responder(true); return; }
+let timer = null;
+const obs = new MutationObserver(() => {
+  if (temProduto()) { obs.disconnect(); clearTimeout(timer); responder(true); }
+});
+obs.observe(document, {childList: true, subtree: true, characterData: true});
+timer = setTimeout(() => { obs.disconnect(); responder(false); }, prazo);
+"""
+
+
+class TemposPronto:
+    """
+    Registro (thread-safe) do tempo até o Product ficar disponível, uma medida
+    por página carregada (a mesma URL em outra cidade/retentativa conta de novo).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.medidas = []   # (url, segundos | None)
+
+    def registrar(self, url: str, segundos):
+        with self._lock:
+            self.medidas.append((url, segundos))
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            prontos = [v for _, v in self.medidas if v is not None]
+            total = len(self.medidas)
+        return {"paginas": total, **percentis(prontos)}
+
+    def resumo(self) -> str:
+        e = self.estatisticas()
+        if "n" not in e:
+            return f"⏱️ Nenhuma página pronta ({e['paginas']} medida(s))."
+        return (
+            f"⏱️ Pronto em {e['n']}/{e['paginas']} páginas — "
+            f"p50 {e['p50']:.2f}s · p95 {e['p95']:.2f}s · máx {e['max']:.2f}s"
+        )
+
+
+TEMPOS = TemposPronto()
+
+
+def esperar_produto(driver, timeout: float = ESPERA_PRODUTO, modo: str = EXTRACAO) -> dict:
+    """
+    Uma chamada execute_async_script: espera o ld+json com Product (ou o prazo)
+    e já devolve {"pronto": bool, "blocos": [...]} ou {"pronto": bool, "produto": {...}}.
+    O script timeout do driver (build_driver) precisa cobrir o prazo.
+    """
+    try:
+        return driver.execute_async_script(JS_ESPERA_PRODUTO, int(timeout * 1000), modo) or {}
+    except Exception as e:
+        print("❌ Erro esperando o Product:", e)
+        return {}
+
+
+def abrir_e_esperar(driver, url: str, timeout: float = ESPERA_PRODUTO, modo: str = EXTRACAO) -> dict:
+    """
+    driver.get + esperar_produto; registra o tempo até pronto (None se não ficou)
+    e a rede da página (requisições, bloqueios, bytes).
+    """
+    t0 = time.monotonic()
+    with ETAPAS.medir("driver_get"):
+        driver.get(url)
+    with ETAPAS.medir("esperar_ldjson"):
+        dados = esperar_produto(driver, timeout, modo)
+    TEMPOS.registrar(url, time.monotonic() - t0 if dados.get("pronto") else None)
+    REDE.coletar(driver, url)
+    return dados
+
+
+def esperar_sumir(driver, el, timeout: float = 3.0):
+    """Espera um elemento sair da tela/DOM (modal fechando, botão sumindo)."""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: not el.is_displayed()
+        )
+    except Exception:
+        # StaleElementReference também significa que saiu do DOM
+        pass
+
+
+def esperar_dom(driver, timeout: float = 10.0):
+    """Espera o documento sair de 'loading' (após um driver.get)."""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script("return document.readyState") != "loading"
+        )
+    except Exception:
+        pass